@@ -0,0 +1,153 @@
+"""
+Run a calculator over a file of scenarios from the command line.
+
+    python app/batch.py sip scenarios.csv -o results.csv
+    python app/batch.py emi loans.jsonl --chunk-size 20000 --workers 4
+
+Each input row is one scenario; the output repeats its columns and adds
+the kernel's results. Rows are read, computed and written a chunk at a
+time on a process pool, so files far larger than memory stream through.
+"""
+import argparse
+import csv
+import io
+import itertools
+import json
+import os
+import sys
+
+from core.batch import KERNELS, InvalidScenario, output_rows, run_kernel
+from core.parallel import cpu_workers, imap_chunks
+
+FORMATS = ("csv", "jsonl")
+CHUNK_SIZE = 10_000
+
+
+def guess_format(path):
+    return "jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv"
+
+
+def read_scenarios(stream, fmt):
+    """
+    Field names and a lazy iterator of rows: lists of strings for CSV,
+    raw lines for JSONL (decoded later, in the workers). JSONL field names
+    are those of the first line; every record is still read by its own keys.
+    """
+    if fmt == "csv":
+        reader = csv.reader(stream)
+        return next(reader, []), reader
+    lines = (line for line in stream if line.strip())
+    first = next(lines, None)
+    if first is None:
+        return [], iter(())
+    return list(json.loads(first)), itertools.chain([first], lines)
+
+
+def iter_tasks(kernel, rows, fields, in_fmt, out_fmt, chunk_size):
+    start = 1
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield kernel, in_fmt, out_fmt, fields, start, chunk
+        start += len(chunk)
+
+
+def run_chunk(task):
+    """Compute one chunk of scenarios and return its output text."""
+    kernel, in_fmt, out_fmt, fields, start, chunk = task
+    spec = KERNELS[kernel]
+    try:
+        if in_fmt == "csv":
+            for offset, row in enumerate(chunk):
+                if len(row) != len(fields):
+                    raise ValueError(f"expected {len(fields)} fields, got {len(row)} (row {start + offset})")
+            records = [dict(zip(fields, row)) for row in chunk]
+            columns = {field: [record[field] for record in records] for field in fields}
+        else:
+            records = [json.loads(line) for line in chunk]
+            for offset, record in enumerate(records):
+                if not isinstance(record, dict):
+                    raise ValueError(f"expected a JSON object (row {start + offset})")
+            # Records need not share keys: absent optional inputs take their defaults
+            columns = {column: [record.get(column, spec.defaults.get(column)) for record in records]
+                       for column in spec.inputs + tuple(spec.defaults)}
+        outputs = run_kernel(kernel, columns)
+    except InvalidScenario as exc:
+        raise ValueError(f"row {start + exc.row}: {exc}") from None
+    except (ValueError, TypeError, KeyError) as exc:
+        raise ValueError(f"rows {start}-{start + len(chunk) - 1}: {exc}") from None
+
+    out = io.StringIO()
+    if out_fmt == "csv":
+        writer = csv.writer(out, lineterminator="\n")
+        for record, result in zip(records, output_rows(outputs)):
+            writer.writerow([record.get(field, spec.defaults.get(field)) for field in fields]
+                            + ["" if value is None else value for value in result.values()])
+    else:
+        for record, result in zip(records, output_rows(outputs)):
+            record.update(result)
+            out.write(json.dumps(record))
+            out.write("\n")
+    return out.getvalue()
+
+
+def run_batch(kernel, source, sink, in_fmt="csv", out_fmt="csv", chunk_size=CHUNK_SIZE, workers=None):
+    """Stream scenarios from the text stream `source` through `kernel` into `sink`."""
+    spec = KERNELS[kernel]
+    fields, rows = read_scenarios(source, in_fmt)
+    if in_fmt == "csv":
+        missing = [column for column in spec.inputs if column not in fields]
+        if missing:
+            raise ValueError(f"{kernel} needs column(s) {', '.join(missing)}")
+    else:
+        # A required input missing from a record is reported for its row
+        fields = list(fields) + [column for column in spec.inputs + tuple(spec.defaults) if column not in fields]
+    header = io.StringIO()
+    if out_fmt == "csv":
+        csv.writer(header, lineterminator="\n").writerow(list(fields) + list(spec.outputs))
+    header = header.getvalue()
+    for text in imap_chunks(run_chunk, iter_tasks(kernel, rows, fields, in_fmt, out_fmt, chunk_size), workers):
+        # Nothing is written until the first chunk has passed validation
+        sink.write(header + text)
+        header = ""
+    sink.write(header)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a finance calculator over a CSV or JSONL file of scenarios.")
+    parser.add_argument("kernel", choices=sorted(KERNELS), help="calculation to run")
+    parser.add_argument("input", help="scenario file, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="result file (default: stdout)")
+    parser.add_argument("--input-format", choices=FORMATS, help="default: from the file extension, else csv")
+    parser.add_argument("--output-format", choices=FORMATS, help="default: from the file extension, else csv")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help=f"rows per task (default: {CHUNK_SIZE})")
+    parser.add_argument("--workers", type=int, default=cpu_workers(), help="worker processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1 or args.workers < 1:
+        parser.error("--chunk-size and --workers must be at least 1")
+
+    spec = KERNELS[args.kernel]
+    in_fmt = args.input_format or guess_format(args.input)
+    out_fmt = args.output_format or guess_format(args.output)
+    source = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        run_batch(args.kernel, source, sink, in_fmt, out_fmt, args.chunk_size, args.workers)
+    except ValueError as exc:
+        if sink is not sys.stdout:
+            # Leave no partial results behind
+            sink.close()
+            os.remove(args.output)
+        parser.exit(1, f"{parser.prog}: error: {exc}\n"
+                       f"columns for {args.kernel}: {', '.join(spec.inputs)}"
+                       f"{' (optional: ' + ', '.join(spec.defaults) + ')' if spec.defaults else ''}\n")
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+
+if __name__ == "__main__":
+    main()
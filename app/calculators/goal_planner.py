@@ -0,0 +1,107 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+from utils.common import format_inr
+from utils.export import export_options
+from utils.table import paged_table
+from core.goals import (
+    required_sip, required_step_up_sip, required_lumpsum, required_annual_saving, required_sip_rate,
+)
+
+GOAL_COLUMNS = ["Goal", "Target", "Years", "Return (%)", "Step-up (%)"]
+
+def read_goals(goals):
+    """
+    Check an uploaded goals table and coerce its numeric columns. Returns
+    the usable rows and how many rows were dropped for a missing,
+    non-numeric or out-of-range target, horizon, return or step-up.
+    """
+    missing = set(GOAL_COLUMNS) - set(goals.columns)
+    if missing:
+        raise ValueError(f"Goals file is missing column(s): {', '.join(sorted(missing))}")
+    numeric = GOAL_COLUMNS[1:]
+    goals = goals.copy()
+    goals[numeric] = goals[numeric].apply(pd.to_numeric, errors="coerce")
+    valid = (
+        np.isfinite(goals[numeric]).all(axis=1)
+        & (goals["Target"] > 0) & (goals["Years"] > 0)
+        & (goals["Return (%)"] >= 0) & (goals["Step-up (%)"] >= 0)
+    )
+    return goals[valid].reset_index(drop=True), int((~valid).sum())
+
+def plan_goals(goals):
+    """Required SIP, step-up SIP, lumpsum and yearly saving for every goal row."""
+    target = goals["Target"].to_numpy(dtype=float)
+    years = goals["Years"].to_numpy(dtype=float)
+    rate = goals["Return (%)"].to_numpy(dtype=float)
+    step_up = goals["Step-up (%)"].to_numpy(dtype=float)
+
+    plans = goals[GOAL_COLUMNS].copy()
+    plans["Monthly SIP"] = required_sip(target, rate, years * 12).round(2)
+    plans["Starting Step-up SIP"] = required_step_up_sip(target, step_up, rate, years).round(2)
+    plans["Lumpsum Today"] = required_lumpsum(target, rate, years).round(2)
+    plans["Yearly Saving"] = required_annual_saving(target, rate, years).round(2)
+    return plans
+
+def render():
+    st.header("🎯 Goal Planner")
+
+    st.write("Work backwards from a target corpus to what you need to invest.")
+
+    mode = st.radio("Plan", ["Single Goal", "Bulk Goals (CSV)"], horizontal=True)
+
+    if mode == "Single Goal":
+        target = st.number_input("Target Corpus (₹)", value=10000000.0, min_value=10000.0)
+        years = st.slider("Years to Goal", 1, 40, 15)
+        rate = st.slider("Expected Return (p.a. %)", 1.0, 20.0, 12.0)
+        step_up = st.slider("Annual Step-up (%)", 0, 50, 10)
+
+        goals = pd.DataFrame([["Goal", target, years, rate, step_up]], columns=GOAL_COLUMNS)
+        plan = plan_goals(goals).iloc[0]
+
+        st.success(f"Monthly SIP Needed: {format_inr(plan['Monthly SIP'])}")
+        st.info(f"Starting SIP with {step_up}% Step-up: {format_inr(plan['Starting Step-up SIP'])}")
+        st.info(f"Lumpsum Needed Today: {format_inr(plan['Lumpsum Today'])}")
+        st.info(f"Yearly Saving Needed: {format_inr(plan['Yearly Saving'])}")
+
+        st.markdown("### 🔁 Required Return for a Fixed SIP")
+        budget = st.number_input("Monthly SIP You Can Afford (₹)", value=20000.0, min_value=500.0)
+        result = required_sip_rate(target, budget, years * 12)
+        if result.converged[0]:
+            st.success(f"Required Return: {result.root[0]:.2f}% p.a.")
+        else:
+            st.error("This SIP cannot reach the target at any return between 0% and 1200%.")
+
+        summary = {
+            "Target Corpus": format_inr(target),
+            "Years": years,
+            "Expected Return": f"{rate:.2f}%",
+            "Monthly SIP Needed": format_inr(plan["Monthly SIP"]),
+            "Starting Step-up SIP": format_inr(plan["Starting Step-up SIP"]),
+            "Lumpsum Needed": format_inr(plan["Lumpsum Today"]),
+        }
+        export_options(summary=summary, pdf_filename="goal_plan_summary.pdf")
+
+    else:
+        st.caption(f"CSV columns: {', '.join(GOAL_COLUMNS)}")
+        uploaded = st.file_uploader("Goals (CSV)", type=["csv"])
+        if uploaded is None:
+            return
+        try:
+            goals, dropped = read_goals(pd.read_csv(uploaded))
+        except ValueError as exc:
+            st.error(str(exc))
+            return
+        if dropped:
+            st.warning(f"Skipped {dropped:,} row(s) with a missing or non-numeric value, a target or horizon "
+                       "that is not positive, or a negative return or step-up.")
+        if goals.empty:
+            st.error("The goals file has no usable rows.")
+            return
+
+        plans = plan_goals(goals)
+        st.success(f"Planned {len(plans)} goals")
+        paged_table(plans, "goal_plans_table",
+                    money_columns=("Target", "Monthly SIP", "Starting Step-up SIP", "Lumpsum Today", "Yearly Saving"))
+
+        export_options(plans, "goal_plans.csv")
@@ -2,33 +2,159 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from utils.common import plot_investment_vs_return, format_inr
-from utils.export import generate_csv_download, generate_pdf_report
+from utils.common import plot_investment_vs_return, format_inr, calculate_emi
+from utils.formatting import format_inr_columns
+from utils.table import paged_table
+from utils.export import export_options
+from core.amortization import amortize_batch, resume_batch, first_changed_month, PREPAY_TYPES
+from core.floating import amortize_floating, RESET_MODES
+from core.loans import loan_principal, loan_tenure, loan_rate
+from core.prepay_optimizer import optimize_prepayment
+from core.cache import memoize
 
-def calculate_emi(P, r, n):
-    monthly_rate = r / 12 / 100
-    return P * monthly_rate * ((1 + monthly_rate) ** n) / (((1 + monthly_rate) ** n) - 1)
+# Shared across sessions: popular loan scenarios are built once
+cached_amortize_batch = memoize(maxsize=256)(amortize_batch)
+cached_amortize_floating = memoize(maxsize=256)(amortize_floating)
 
 def calculate_principal(EMI, r, n):
-    monthly_rate = r / 12 / 100
-    return EMI * (((1 + monthly_rate) ** n) - 1) / (monthly_rate * ((1 + monthly_rate) ** n))
+    return float(loan_principal(EMI, r, n))
 
 def calculate_tenure(P, EMI, r):
-    monthly_rate = r / 12 / 100
-    return np.log(EMI / (EMI - P * monthly_rate)) / np.log(1 + monthly_rate)
-
-def calculate_interest_rate(P, EMI, n, tol=1e-6, max_iter=1000):
-    low, high = 0.01, 100.0
-    for _ in range(max_iter):
-        mid = (low + high) / 2
-        guess_emi = calculate_emi(P, mid, n)
-        if abs(guess_emi - EMI) < tol:
-            return mid
-        elif guess_emi > EMI:
-            high = mid
-        else:
-            low = mid
-    return mid
+    return float(loan_tenure(P, EMI, r))
+
+def calculate_interest_rate(P, EMI, n):
+    """Annual rate in %, or NaN when no rate turns P into this EMI over n months."""
+    return float(loan_rate(P, EMI, n)[0])
+
+def build_schedule_df(schedule, loan=0, start=None):
+    """Turn one row of an AmortizationSchedule into a dated DataFrame."""
+    n = int(schedule.tenure[loan])
+    start = start or datetime.today().replace(day=1)
+    df = pd.DataFrame({
+        "Date": pd.date_range(start + pd.DateOffset(months=1), periods=n, freq="MS"),
+        "EMI": schedule.payment[loan, :n],
+        "Interest": schedule.interest[loan, :n],
+        "Principal": schedule.principal[loan, :n],
+        "Prepayment": schedule.prepayment[loan, :n],
+        "Balance": schedule.balance[loan, :n],
+    })
+    df["Total Paid"] = (df["EMI"] + df["Prepayment"]).cumsum()
+    df["Principal Paid"] = (df["Principal"] + df["Prepayment"]).cumsum()
+    return df
+
+def incremental_schedule(inputs):
+    """Rebuild only the months after the first one the new inputs affect."""
+    previous_inputs, previous = st.session_state.get("emi_schedule", (None, None))
+    from_month = first_changed_month(previous_inputs, inputs)
+    if from_month is None:
+        schedule = previous
+    elif from_month == 1:
+        schedule = cached_amortize_batch(*inputs)
+    else:
+        schedule = resume_batch(previous, from_month, *inputs)
+    st.session_state.emi_schedule = (inputs, schedule)
+    return schedule
+
+def render_floating(loan_amt, interest_rate, months, resets, reset_mode,
+                    prepay_type, prepay_amount, prepay_start_month, reduce_type):
+    resets = resets.dropna()
+    result = cached_amortize_floating(
+        loan_amt, interest_rate, months,
+        reset_months=resets["From Month"].to_numpy(dtype=float),
+        reset_rates=resets["Rate (%)"].to_numpy(dtype=float),
+        reset_mode=RESET_MODES[reset_mode],
+        prepay_type=PREPAY_TYPES[prepay_type],
+        prepay_amount=prepay_amount,
+        prepay_start=prepay_start_month,
+        reduce_emi=reduce_type == "Reduce EMI",
+    )
+    # Same prepayment plan at the starting rate throughout, so the difference is the rate effect alone
+    fixed = cached_amortize_floating(
+        loan_amt, interest_rate, months,
+        prepay_type=PREPAY_TYPES[prepay_type],
+        prepay_amount=prepay_amount,
+        prepay_start=prepay_start_month,
+        reduce_emi=reduce_type == "Reduce EMI",
+    )
+    total_months = int(result.tenure[0])
+    fixed_interest = fixed.total_interest[0]
+
+    segments = pd.DataFrame({
+        "From Month": result.segment_start[0].astype(int),
+        "Rate (%)": result.segment_rate[0].round(2),
+        "EMI": result.segment_emi[0].round(2),
+        "Opening Balance": result.segment_balance[0].round(2),
+    })
+
+    st.markdown("### 📌 Loan Summary")
+    st.info(f"Actual Tenure: {total_months // 12} years {total_months % 12} months")
+    st.info(f"Total Payment: {format_inr(result.total_paid[0])}")
+    st.info(f"Total Interest Paid: {format_inr(result.total_interest[0])}")
+    st.info(f"Interest Difference vs Fixed Rate: {format_inr(result.total_interest[0] - fixed_interest)}")
+    if result.outstanding[0] > 0:
+        st.warning(f"Loan not repaid within {total_months} months, outstanding {format_inr(result.outstanding[0])}")
+
+    st.markdown("### 📑 Rate Segments")
+    st.dataframe(format_inr_columns(segments, ["EMI", "Opening Balance"], decimals=2))
+
+    summary = {
+        "Loan Amount": format_inr(loan_amt),
+        "Starting Rate": f"{interest_rate:.2f}%",
+        "Rate Resets": len(resets),
+        "On Reset": reset_mode,
+        "Final Tenure": f"{total_months} months",
+        "Final EMI": format_inr(result.emi[0]),
+        "Prepayment Type": prepay_type,
+        "Total Interest": format_inr(result.total_interest[0])
+    }
+    export_options(segments, "floating_rate_segments.csv", summary, "floating_loan_summary.pdf")
+
+@st.fragment
+def render_optimizer(loan_amt, interest_rate, months):
+    st.markdown("### 🧠 Prepayment Optimizer")
+    st.caption("Search prepayment amount, frequency and start month within the cash you can spare. "
+               "Plans keep the EMI and shorten the tenure, which always saves at least as much as reducing the EMI.")
+
+    with st.form("prepay_optimizer"):
+        initial_cash = st.number_input("Cash Available Now (₹)", value=200000.0, min_value=0.0)
+        monthly_surplus = st.number_input("Monthly Surplus for Prepayments (₹)", value=15000.0, min_value=0.0)
+        objective = st.radio("Minimize", ["Total Interest", "Tenure"], horizontal=True)
+        submitted = st.form_submit_button("🔍 Find Best Strategies")
+
+    if not submitted:
+        return
+
+    max_amount = min(loan_amt, initial_cash + monthly_surplus * months)
+    if max_amount <= 0:
+        st.warning("There is no cash available for prepayments.")
+        return
+    plans = optimize_prepayment(
+        loan_amt, interest_rate, months, initial_cash, monthly_surplus,
+        amounts=np.unique(np.round(np.linspace(0, max_amount, 201)[1:], -2)),
+        starts=np.arange(1, min(months, 120) + 1),
+        objective="interest" if objective == "Total Interest" else "tenure",
+    )
+    if plans.evaluated == 0:
+        st.warning("No prepayment plan fits within this budget.")
+        return
+
+    st.info(f"Searched {plans.candidates:,} strategies: {plans.feasible:,} fit the budget, "
+            f"{plans.evaluated:,} left after pruning dominated ones.")
+    labels = {code: name for name, code in PREPAY_TYPES.items()}
+    baseline = calculate_emi(loan_amt, interest_rate, months) * months - loan_amt
+    top = pd.DataFrame({
+        "Frequency": [labels[t] for t in plans.prepay_type[:10]],
+        "Amount": plans.prepay_amount[:10],
+        "Start Month": plans.prepay_start[:10],
+        "Total Interest": plans.total_interest[:10].round(2),
+        "Interest Saved": (baseline - plans.total_interest[:10]).round(2),
+        "Tenure (Months)": plans.tenure[:10],
+        "Cash Used": plans.total_prepaid[:10].round(2),
+    })
+    best = top.iloc[0]
+    st.success(f"Best: {best['Frequency']} prepayment of {format_inr(best['Amount'])} from month "
+               f"{best['Start Month']}, saving {format_inr(best['Interest Saved'])}")
+    st.dataframe(format_inr_columns(top, ["Amount", "Total Interest", "Interest Saved", "Cash Used"]))
 
 def render():
     st.header("🏠 Home Loan EMI Calculator (4-Way Solver with Prepayment)")
@@ -43,6 +169,20 @@ def render():
         emi = calculate_emi(loan_amt, interest_rate, months)
         st.success(f"Monthly EMI: {format_inr(emi)}")
 
+        # 📉 Rate Type
+        rate_type = st.radio("Interest Rate Type", ["Fixed", "Floating"], horizontal=True)
+        resets = None
+        reset_mode = "Recompute EMI"
+
+        if rate_type == "Floating":
+            st.caption("Each row sets a new rate from the given month onwards.")
+            resets = st.data_editor(
+                pd.DataFrame({"From Month": [37, 73], "Rate (%)": [interest_rate + 0.5, interest_rate - 0.5]}),
+                num_rows="dynamic",
+                key="rate_resets",
+            )
+            reset_mode = st.radio("When the rate resets, what should change?", list(RESET_MODES))
+
         # 🏦 Prepayment Options
         st.markdown("### 🏦 Prepayment Options")
         prepay_type = st.selectbox("Prepayment Frequency", ["None", "One-time", "Yearly", "Monthly"])
@@ -56,73 +196,56 @@ def render():
             prepay_start_month = st.number_input("Start Prepayment After (in months)", value=12, min_value=1)
             reduce_type = st.radio("When you prepay, what should reduce?", ["Reduce Tenure", "Reduce EMI"])
 
+        if rate_type == "Floating":
+            render_floating(loan_amt, interest_rate, months, resets, reset_mode,
+                            prepay_type, prepay_amount, prepay_start_month, reduce_type)
+            return
+
         # Without prepayment total interest for comparison
-        original_total_payment = emi * months
+        original_total_interest = emi * months - loan_amt
 
         # Amortization with Prepayment
-        principal_remaining = loan_amt
-        data = []
-        month = 0
-        total_interest_paid = 0
-
-        while principal_remaining > 0 and month < 1000:
-            month += 1
-            interest = principal_remaining * (interest_rate / 1200)
-            principal = emi - interest
-            principal_remaining -= principal
-            total_interest_paid += interest
-
-            if prepay_type != "None" and month >= prepay_start_month:
-                if prepay_type == "One-time" and month == prepay_start_month:
-                    principal_remaining -= prepay_amount
-                elif prepay_type == "Yearly" and (month - prepay_start_month) % 12 == 0:
-                    principal_remaining -= prepay_amount
-                elif prepay_type == "Monthly":
-                    principal_remaining -= prepay_amount
-
-                if reduce_type == "Reduce EMI":
-                    remaining_months = max(1, months - month)
-                    emi = calculate_emi(principal_remaining, interest_rate, remaining_months)
-
-            if principal_remaining < 0:
-                principal += principal_remaining
-                principal_remaining = 0
-
-            date = datetime.today().replace(day=1) + pd.DateOffset(months=month)
-            data.append([date, emi * month, principal])
-
-        df = pd.DataFrame(data, columns=["Date", "Total Paid", "Principal Paid"])
-        df["Investment"] = df["Total Paid"] - df["Principal Paid"]
-        df.rename(columns={"Principal Paid": "Returns"}, inplace=True)
-
-        total_paid = df["Total Paid"].iloc[-1]
-        total_months = len(df)
+        schedule = incremental_schedule((
+            loan_amt, interest_rate, months,
+            PREPAY_TYPES[prepay_type], prepay_amount, prepay_start_month,
+            reduce_type == "Reduce EMI",
+        ))
+        df = build_schedule_df(schedule)
+
+        total_paid = schedule.total_paid[0]
+        total_interest_paid = schedule.total_interest[0]
+        total_months = int(schedule.tenure[0])
+        interest_saved = original_total_interest - total_interest_paid
 
         # 📊 Chart
-        plot_investment_vs_return(df)
+        plot_investment_vs_return(df, investment_label="Total Paid", return_label="Principal Paid")
 
         # 📌 Detailed Summary
         st.markdown("### 📌 Loan Summary")
         st.info(f"Actual Tenure: {total_months // 12} years {total_months % 12} months")
         st.info(f"Total Payment: {format_inr(total_paid)}")
         st.info(f"Total Interest Paid: {format_inr(total_interest_paid)}")
-        st.info(f"Interest Saved vs No Prepayment: {format_inr(original_total_payment - total_paid)}")
+        st.info(f"Interest Saved vs No Prepayment: {format_inr(interest_saved)}")
 
-        # 🧾 Export
-        st.markdown("### 📤 Export Options")
-        generate_csv_download(df, filename="home_loan_schedule.csv")
+        st.markdown("### 📅 Amortization Schedule")
+        paged_table(df, "emi_schedule_table", date_column="Date",
+                    last_columns=("Balance", "Total Paid", "Principal Paid"),
+                    money_columns=("EMI", "Interest", "Principal", "Prepayment", "Balance", "Total Paid", "Principal Paid"))
 
+        # 🧾 Export
         summary = {
             "Loan Amount": format_inr(loan_amt),
             "Interest Rate": f"{interest_rate:.2f}%",
             "Original Tenure": f"{tenure_years} years",
             "Final Tenure": f"{total_months} months",
-            "Monthly EMI": format_inr(emi),
+            "Monthly EMI": format_inr(schedule.emi[0]),
             "Prepayment Type": prepay_type,
             "Prepayment Impact": reduce_type,
-            "Interest Saved": format_inr(original_total_payment - total_paid)
+            "Interest Saved": format_inr(interest_saved)
         }
-        generate_pdf_report(summary, filename="home_loan_summary.pdf")
+        export_options(df, "home_loan_schedule.csv", summary, "home_loan_summary.pdf")
+
+        render_optimizer(loan_amt, interest_rate, months)
 
     elif mode == "Principal":
         emi = st.number_input("Monthly EMI (₹)", value=25000.0, min_value=500.0)
@@ -138,13 +261,20 @@ def render():
         tenure_years = st.slider("Tenure (Years)", 1, 30, 20)
         months = tenure_years * 12
         rate = calculate_interest_rate(principal, emi, months)
-        st.success(f"Estimated Interest Rate: {rate:.2f}%")
+        if np.isnan(rate):
+            st.error("No interest rate fits these inputs: the EMI must repay the loan amount within the tenure.")
+        else:
+            st.success(f"Estimated Interest Rate: {rate:.2f}%")
 
     elif mode == "Tenure":
         emi = st.number_input("Monthly EMI (₹)", value=25000.0, min_value=500.0)
         principal = st.number_input("Loan Amount (₹)", value=2500000.0, min_value=10000.0)
         interest_rate = st.slider("Interest Rate (p.a. %)", 5.0, 15.0, 8.5)
-        months = int(np.ceil(calculate_tenure(principal, emi, interest_rate)))
+        tenure = calculate_tenure(principal, emi, interest_rate)
+        if not np.isfinite(tenure):
+            st.error("This EMI does not cover the monthly interest, so the loan is never repaid.")
+            return
+        months = int(np.ceil(tenure))
         years = months // 12
         rem_months = months % 12
         st.success(f"Tenure: {years} years {rem_months} months")
\ No newline at end of file
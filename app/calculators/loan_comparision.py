@@ -1,90 +1,277 @@
 # calculators/loan_comparison.py
+import os
+import tempfile
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
+import numpy as np
+import plotly.graph_objects as go
 from io import BytesIO
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet
+from utils.charts import plot_lines
+from utils.export import export_options, combine_frames
+from utils.formatting import format_inr, format_inr_columns
+from utils.table import paged_table
+from core.loans import LoanTerms, summarize_loans
+from core.amortization import amortize_batch
+from core.cache import memoize
+from core.schedule_store import ScheduleStore, write_schedules
+
+MONEY_COLUMNS = ["Principal", "EMI", "Total Payment", "Total Interest"]
+
+def schedules_frame(schedule, labels):
+    """Month-by-month schedules of every loan, stacked into one table."""
+    frames = {}
+    for i, label in enumerate(labels):
+        n = int(schedule.tenure[i])
+        frames[label] = pd.DataFrame({
+            "Month": np.arange(1, n + 1),
+            "EMI": schedule.payment[i, :n],
+            "Interest": schedule.interest[i, :n],
+            "Principal": schedule.principal[i, :n],
+            "Balance": schedule.balance[i, :n],
+        })
+    return combine_frames(frames, label="Loan")
+
+LOAN_BOOK_COLUMNS = ["Loan ID", "Principal", "Rate (%)", "Tenure (Years)"]
+RANK_BY = ["Total Interest", "Total Payment", "EMI", "Rate (%)"]
+# Text columns with at most this many values are offered as filters and groupings
+MAX_CATEGORIES = 50
+# Stores are only written below this directory
+STORE_DIR_ENV = "FINCALC_STORE_DIR"
+
+def read_loan_book(data, filename):
+    """
+    Parse a CSV or Parquet loan book from its bytes and check its columns.
+    Returns the usable rows and how many rows were dropped for a missing,
+    non-numeric or out-of-range principal, rate or tenure.
+    """
+    source = BytesIO(data)
+    book = pd.read_parquet(source) if filename.lower().endswith(".parquet") else pd.read_csv(source)
+    # Match the required headers case-insensitively
+    canonical = {c.lower(): c for c in LOAN_BOOK_COLUMNS}
+    book.columns = [canonical.get(str(c).strip().lower(), str(c).strip()) for c in book.columns]
+    missing = set(LOAN_BOOK_COLUMNS) - set(book.columns)
+    if missing:
+        raise ValueError(f"Loan book is missing column(s): {', '.join(sorted(missing))}")
+    numeric = LOAN_BOOK_COLUMNS[1:]
+    book[numeric] = book[numeric].apply(pd.to_numeric, errors="coerce")
+    valid = (
+        book["Loan ID"].notna()
+        & np.isfinite(book[numeric]).all(axis=1)
+        & (book["Principal"] > 0) & (book["Rate (%)"] >= 0) & (book["Tenure (Years)"] > 0)
+    )
+    return book[valid].reset_index(drop=True), int((~valid).sum())
+
+cached_read_loan_book = memoize(maxsize=8)(read_loan_book)
+
+def loan_months(book):
+    """Tenures in whole months, as the schedules are built."""
+    return np.round(book["Tenure (Years)"].to_numpy(dtype=float) * 12).astype(int)
+
+def evaluate_loan_book(book):
+    """EMI, total payment and total interest for every row, in one vectorized pass."""
+    summary = summarize_loans(LoanTerms(
+        principal=book["Principal"].to_numpy(dtype=float),
+        rate=book["Rate (%)"].to_numpy(dtype=float),
+        months=loan_months(book),
+    ))
+    results = book.copy()
+    results["EMI"] = summary.emi.round(2)
+    results["Total Payment"] = summary.total_payment.round(2)
+    results["Total Interest"] = summary.total_interest.round(2)
+    return results
+
+def rank_loans(results, by, within=None):
+    """1-based rank on `by` (lowest first), overall or within each `within` group."""
+    values = results[by]
+    # Rows with a blank group value are ranked together rather than left unranked
+    ranks = (values.groupby(results[within], dropna=False).rank(method="first") if within
+             else values.rank(method="first"))
+    return ranks.astype(int)
+
+def summarize_groups(results, column):
+    return results.groupby(column, dropna=False).agg(
+        Loans=("Loan ID", "size"),
+        Principal=("Principal", "sum"),
+        **{"Average Rate (%)": ("Rate (%)", "mean"),
+           "Total EMI": ("EMI", "sum"),
+           "Total Interest": ("Total Interest", "sum")},
+    ).reset_index()
+
+def store_root():
+    return os.path.abspath(os.environ.get(STORE_DIR_ENV) or os.path.join(tempfile.gettempdir(), "fincalc_schedules"))
+
+def store_path(name):
+    """Directory of the store called `name`, which must stay inside store_root()."""
+    root = store_root()
+    path = os.path.realpath(os.path.join(root, name))
+    if not name.strip() or os.path.commonpath([path, os.path.realpath(root)]) != os.path.realpath(root) \
+            or path == os.path.realpath(root):
+        raise ValueError(f"Store name must be a folder name inside {root}")
+    return path
+
+def store_keys(book):
+    """Loan IDs as store keys; repeated IDs (several offers per loan) get a /1, /2, ... suffix."""
+    ids = book["Loan ID"].astype(str)
+    if ids.is_unique:
+        return ids.tolist()
+    return (ids + "/" + (ids.groupby(ids).cumcount() + 1).astype(str)).tolist()
+
+@st.fragment
+def render_schedule_store(book):
+    st.markdown("### 💾 Schedule Store")
+    st.caption("Write every loan's monthly schedule to a compact on-disk store, then look loans up by ID "
+               "without recomputing or loading the whole book.")
+    cols = st.columns([3, 1])
+    name = cols[0].text_input("Store Name", "loan_book", help=f"A folder inside {store_root()}")
+    compact = cols[1].toggle("float32", help="Half the size; amounts keep about 7 significant digits")
+    try:
+        path = store_path(name)
+    except ValueError as exc:
+        st.error(str(exc))
+        return
+    keys = store_keys(book)
+    if st.button("Write Schedules", help="Replaces the store's contents with this book"):
+        with st.spinner(f"Amortizing {len(keys):,} loans..."):
+            try:
+                store = write_schedules(
+                    path, keys, book["Principal"].to_numpy(dtype=float), book["Rate (%)"].to_numpy(dtype=float),
+                    loan_months(book), start=np.datetime64("today", "M"),
+                    dtype="float32" if compact else "float64", replace=True,
+                )
+            except (OSError, ValueError) as exc:
+                st.error(f"Could not write the store: {exc}")
+                return
+        st.success(f"Store holds {len(store):,} loans and {store.rows:,} monthly rows")
+
+    if not os.path.exists(os.path.join(path, "meta.json")):
+        return
+    store = ScheduleStore(path)
+    loan_id = st.text_input("Look up Loan ID", store.loan_ids[0] if len(store) else "")
+    if loan_id not in store:
+        st.warning(f"{loan_id} is not in the store")
+        return
+    schedule = store.schedule(loan_id)
+    df = pd.DataFrame({
+        "Date": store.dates(loan_id).astype("datetime64[s]"),
+        "EMI": schedule["payment"],
+        "Interest": schedule["interest"],
+        "Principal": schedule["principal"],
+        "Balance": schedule["balance"],
+    })
+    paged_table(df, "stored_schedule_table", date_column="Date", last_columns=("Balance",),
+                money_columns=("EMI", "Interest", "Principal", "Balance"))
+
+def render_loan_book():
+    st.caption(f"Required columns: {', '.join(LOAN_BOOK_COLUMNS)}. Extra text columns such as "
+               "Lender or Offer can be used to rank, group and filter.")
+    uploaded = st.file_uploader("Loan Book (CSV or Parquet)", type=["csv", "parquet"])
+    if uploaded is None:
+        return
+    try:
+        book, dropped = cached_read_loan_book(uploaded.getvalue(), uploaded.name)
+    except ValueError as exc:
+        st.error(str(exc))
+        return
+    if dropped:
+        st.warning(f"Skipped {dropped:,} row(s) with a missing or non-numeric value, a principal or tenure "
+                   "that is not positive, or a negative rate.")
+    if book.empty:
+        st.warning("The loan book has no usable rows.")
+        return
+
+    results = evaluate_loan_book(book)
+    categories = [c for c in results.columns
+                  if c not in LOAN_BOOK_COLUMNS and not pd.api.types.is_numeric_dtype(results[c])
+                  and results[c].nunique() <= MAX_CATEGORIES]
+
+    st.success(f"Evaluated {len(results):,} loans")
+    st.info(f"Total Principal: {format_inr(results['Principal'].sum(), abbreviate=True)}")
+    st.info(f"Total Interest: {format_inr(results['Total Interest'].sum(), abbreviate=True)}")
+
+    st.markdown("### 🏅 Ranking")
+    cols = st.columns(3)
+    rank_by = cols[0].selectbox("Rank by (lowest first)", RANK_BY)
+    within = cols[1].selectbox("Rank within", ["All loans", "Loan ID"] + categories)
+    within = None if within == "All loans" else within
+    best_only = cols[2].toggle("Best per group only", disabled=within is None)
+    results["Rank"] = rank_loans(results, rank_by, within)
+    if best_only and within:
+        results = results[results["Rank"] == 1]
+    results = results.sort_values([within, "Rank"] if within else "Rank", kind="stable")
+
+    money = ("Principal", "EMI", "Total Payment", "Total Interest")
+    paged_table(results, "loan_book_table", group_columns=tuple(categories), money_columns=money)
+
+    if categories:
+        st.markdown("### 🧮 Group Totals")
+        group_by = st.selectbox("Group by", categories)
+        groups = summarize_groups(results, group_by)
+        st.dataframe(format_inr_columns(groups, ["Principal", "Total EMI", "Total Interest"], abbreviate=True),
+                     hide_index=True)
+
+    export_options(results, "loan_book_comparison.csv")
+
+    render_schedule_store(book)
 
 def render():
     st.header("📊 Loan Comparison Tool")
 
+    mode = st.radio("Compare", ["Side by Side", "Loan Book (CSV / Parquet)"], horizontal=True)
+    if mode == "Side by Side":
+        render_side_by_side()
+    else:
+        render_loan_book()
+
+def render_side_by_side():
     st.write("Compare multiple loans side by side (EMI, total interest, total payment).")
 
     num_loans = st.number_input("Number of Loans to Compare", min_value=2, max_value=5, value=2)
 
-    loans = []
+    principal, annual_rate, years = [], [], []
     for i in range(num_loans):
         st.subheader(f"Loan {i+1}")
-        principal = st.number_input(f"Principal (Loan {i+1})", min_value=1000, value=500000, step=1000, key=f"p{i}")
-        annual_rate = st.number_input(f"Interest Rate % (Loan {i+1})", min_value=1.0, max_value=50.0, value=8.0, step=0.1, key=f"r{i}")
-        years = st.number_input(f"Tenure (Years, Loan {i+1})", min_value=1, max_value=40, value=20, key=f"t{i}")
-
-        monthly_rate = annual_rate / 12 / 100
-        months = years * 12
-        emi = (principal * monthly_rate * (1 + monthly_rate) ** months) / ((1 + monthly_rate) ** months - 1)
-        total_payment = emi * months
-        total_interest = total_payment - principal
-
-        loans.append({
-            "Loan": f"Loan {i+1}",
-            "Principal": principal,
-            "Rate (%)": annual_rate,
-            "Tenure (Years)": years,
-            "EMI": round(emi, 2),
-            "Total Payment": round(total_payment, 2),
-            "Total Interest": round(total_interest, 2),
-        })
+        principal.append(st.number_input(f"Principal (Loan {i+1})", min_value=1000, value=500000, step=1000, key=f"p{i}"))
+        annual_rate.append(st.number_input(f"Interest Rate % (Loan {i+1})", min_value=1.0, max_value=50.0, value=8.0, step=0.1, key=f"r{i}"))
+        years.append(st.number_input(f"Tenure (Years, Loan {i+1})", min_value=1, max_value=40, value=20, key=f"t{i}"))
+
+    years = np.array(years)
+    summary = summarize_loans(LoanTerms(principal=np.array(principal), rate=np.array(annual_rate), months=years * 12))
+    loans = {
+        "Loan": [f"Loan {i+1}" for i in range(num_loans)],
+        "Principal": principal,
+        "Rate (%)": annual_rate,
+        "Tenure (Years)": years,
+        "EMI": summary.emi.round(2),
+        "Total Payment": summary.total_payment.round(2),
+        "Total Interest": summary.total_interest.round(2),
+    }
 
     df = pd.DataFrame(loans)
     st.subheader("📑 Comparison Table")
-    st.dataframe(df)
-
-    # ------------------ CSV Export ------------------
-    csv = df.to_csv(index=False).encode("utf-8")
-    st.download_button(
-        label="📥 Download as CSV",
-        data=csv,
-        file_name="loan_comparison.csv",
-        mime="text/csv",
-    )
+    st.dataframe(format_inr_columns(df, MONEY_COLUMNS, decimals=2))
 
-    # ------------------ PDF Export ------------------
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter)
-    elements = []
-    style = getSampleStyleSheet()["Normal"]
-
-    # Convert DataFrame to table for PDF
-    data_for_pdf = [df.columns.tolist()] + df.values.tolist()
-    table = Table(data_for_pdf)
-    table.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
-        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-        ("GRID", (0, 0), (-1, -1), 1, colors.black),
-    ]))
-
-    elements.append(Paragraph("Loan Comparison Report", getSampleStyleSheet()["Title"]))
-    elements.append(table)
-    doc.build(elements)
-
-    pdf = buffer.getvalue()
-    buffer.close()
-
-    st.download_button(
-        label="📄 Download as PDF",
-        data=pdf,
-        file_name="loan_comparison.pdf",
-        mime="application/pdf",
-    )
+    # ------------------ CSV / PDF Export ------------------
+    export_options(df, "loan_comparison.csv", pdf_filename="loan_comparison.pdf", pdf_title="Loan Comparison Report",
+                   money_columns=MONEY_COLUMNS)
+    schedule = amortize_batch(principal, annual_rate, years * 12)
+    schedules = schedules_frame(schedule, loans["Loan"])
+    st.subheader("📅 Monthly Schedules")
+    paged_table(schedules, "loan_schedules_table", group_columns=("Loan",), last_columns=("Balance",),
+                money_columns=("EMI", "Interest", "Principal", "Balance"))
+    export_options(schedules, "loan_schedules.csv", heading="🗂️ Export All Schedules (one file)")
 
     # ------------------ Chart ------------------
     st.subheader("📉 Total Payment vs Interest")
-    fig, ax = plt.subplots()
-    df.set_index("Loan")[["Principal", "Total Interest"]].plot(kind="bar", stacked=True, ax=ax)
-    plt.ylabel("Amount (₹)")
-    plt.title("Principal vs Interest")
-    st.pyplot(fig)
+    fig = go.Figure([
+        go.Bar(x=df["Loan"], y=df["Principal"], name="Principal"),
+        go.Bar(x=df["Loan"], y=df["Total Interest"], name="Total Interest"),
+    ])
+    fig.update_layout(barmode="stack", title="Principal vs Interest", yaxis_title="Amount (₹)")
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.subheader("📉 Outstanding Balance")
+    plot_lines(
+        {label: (np.arange(1, n + 1), schedule.balance[i, :n])
+         for i, (label, n) in enumerate(zip(loans["Loan"], schedule.tenure))},
+        title="Balance Over Time", xaxis_title="Month", yaxis_title="Amount (₹)",
+    )
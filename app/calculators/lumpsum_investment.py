@@ -1,8 +1,10 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 from datetime import datetime
 from utils.common import plot_investment_vs_return, format_inr
-from utils.export import generate_csv_download, generate_pdf_report
+from utils.export import export_options
+from core.lumpsum import lumpsum_future_value
 
 def render():
     st.header("💰 Lumpsum Investment Calculator")
@@ -12,7 +14,7 @@ def render():
     rate = st.slider("Annual Return Rate (%)", 5.0, 20.0, 10.0)
     years = st.slider("Investment Duration (Years)", 1, 50, 10)
 
-    future_value = amount * ((1 + rate / 100) ** years)
+    future_value = float(lumpsum_future_value(amount, rate, years))
     total_gain = future_value - amount
 
     st.success(f"Future Value: {format_inr(future_value)}")
@@ -21,19 +23,16 @@ def render():
     # Data for graph
     dates = [datetime.today().replace(day=1) + pd.DateOffset(years=i) for i in range(years + 1)]
     investment = [amount] * (years + 1)
-    returns = [amount * ((1 + rate / 100) ** i) for i in range(years + 1)]
+    returns = lumpsum_future_value(amount, rate, np.arange(years + 1))
 
     df = pd.DataFrame({"Date": dates, "Investment": investment, "Returns": returns})
     plot_investment_vs_return(df)
 
     # 🧾 Export Options
-    st.markdown("### 📤 Export Options")
-    generate_csv_download(df, filename="lumpsum_growth_schedule.csv")
-
     summary = {
         "Investment Amount": format_inr(amount),
         "Return Rate": f"{rate}%",
         "Duration": f"{years} years",
         "Future Value": format_inr(future_value)
     }
-    generate_pdf_report(summary, filename="lumpsum_summary.pdf")
+    export_options(df, "lumpsum_growth_schedule.csv", summary, "lumpsum_summary.pdf")
@@ -0,0 +1,128 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.graph_objects as go
+from utils.export import export_options
+from core.sweep import INTEGER_PARAMS, METRICS, run_sweep
+from core.cache import memoize
+
+cached_run_sweep = memoize(maxsize=8)(run_sweep)
+
+# Parameter -> (label, default sweep start, default sweep end)
+PARAMS = {
+    "amount": ("Monthly SIP (₹)", 1000.0, 100000.0),
+    "step_up": ("Annual Step-up (%)", 0.0, 25.0),
+    "rate": ("Rate (p.a. %)", 5.0, 15.0),
+    "years": ("Years", 5.0, 30.0),
+    "expense": ("Monthly Expense (₹)", 10000.0, 200000.0),
+    "inflation": ("Inflation (%)", 3.0, 10.0),
+    "returns": ("Returns (%)", 5.0, 15.0),
+    "years_to_retire": ("Years to Retire", 5.0, 40.0),
+    "years_post_retire": ("Years After Retirement", 10.0, 40.0),
+    "principal": ("Loan Amount (₹)", 1000000.0, 10000000.0),
+    "prepay_amount": ("Prepayment Amount (₹)", 0.0, 500000.0),
+    "prepay_type": ("Prepayment Type (0 None, 1 One-time, 2 Yearly, 3 Monthly)", 0.0, 3.0),
+    "prepay_start": ("Prepayment Start Month", 1.0, 60.0),
+    "reduce_emi": ("Reduce EMI (0 = Reduce Tenure, 1 = Reduce EMI)", 0.0, 1.0),
+}
+MAX_HEATMAP_SIDE = 300
+MAX_CELLS = 2_000_000
+
+def axis_inputs(name, key):
+    label, low, high = PARAMS[name]
+    cols = st.columns(3)
+    # Keyed by parameter too, so switching the axis does not carry over the old range
+    start = cols[0].number_input(f"{label} from", value=low, key=f"{key}_{name}_from")
+    stop = cols[1].number_input(f"{label} to", value=high, key=f"{key}_{name}_to")
+    steps = cols[2].number_input(f"{label} steps", value=21, min_value=1, max_value=5000, key=f"{key}_{name}_steps")
+    values = np.linspace(start, stop, int(steps))
+    if name in INTEGER_PARAMS:
+        # Computed as whole numbers, so sweep (and label) only those
+        return np.unique(np.round(values)).astype(int)
+    return values
+
+def format_value(value):
+    return f"{value:,}" if isinstance(value, (int, np.integer)) else f"{value:,.2f}"
+
+def grid_to_frame(grid, axes, metric):
+    """Long-format table with one row per grid cell."""
+    mesh = np.meshgrid(*axes.values(), indexing="ij")
+    df = pd.DataFrame({PARAMS[name][0]: values.ravel() for name, values in zip(axes, mesh)})
+    df[metric] = grid.ravel()
+    return df
+
+@st.fragment
+def render_result(grid, axes, metric, x_name, y_name, z_name):
+    """Heatmap, table and export; moving the slice slider reruns only this."""
+    label = lambda name: PARAMS[name][0]
+
+    if grid.ndim == 3:
+        z_values = axes[z_name]
+        z_index = st.slider(label(z_name), 0, len(z_values) - 1, 0, format="%d")
+        st.caption(f"{label(z_name)} = {format_value(z_values[z_index])}")
+        plane = grid[:, :, z_index]
+    else:
+        plane = grid
+
+    # Thin out very large planes for display; the export keeps every cell
+    row_step = max(1, -(-plane.shape[0] // MAX_HEATMAP_SIDE))
+    col_step = max(1, -(-plane.shape[1] // MAX_HEATMAP_SIDE))
+    shown = plane[::row_step, ::col_step]
+    y_shown, x_shown = axes[y_name][::row_step], axes[x_name][::col_step]
+
+    fig = go.Figure(go.Heatmap(z=shown, x=x_shown, y=y_shown, colorbar=dict(title=metric)))
+    fig.update_layout(title=metric, xaxis_title=label(x_name), yaxis_title=label(y_name))
+    st.plotly_chart(fig, use_container_width=True)
+
+    table = pd.DataFrame(shown, index=np.round(y_shown, 2), columns=np.round(x_shown, 2))
+    table.index.name = label(y_name)
+    st.dataframe(table)
+
+    # The long table is as big as the grid, so it is only built for a download
+    export_options(lambda: grid_to_frame(grid, axes, metric), "sensitivity_sweep.csv")
+
+def render():
+    st.header("🗺️ Sensitivity Sweep")
+
+    st.write("Evaluate a whole grid of inputs at once and see how the result moves.")
+
+    metric = st.selectbox("Result to Sweep", list(METRICS))
+    _, defaults = METRICS[metric]
+    names = list(defaults)
+    label = lambda name: PARAMS[name][0]
+
+    y_name = st.selectbox("Rows", names, format_func=label, index=min(1, len(names) - 1))
+    x_name = st.selectbox("Columns", [n for n in names if n != y_name], format_func=label)
+    rest = [n for n in names if n not in (x_name, y_name)]
+    z_name = st.selectbox("Slices (optional)", ["None"] + rest, format_func=lambda n: n if n == "None" else label(n))
+
+    st.markdown("### 📐 Grid")
+    axes = {y_name: axis_inputs(y_name, "sweep_y"), x_name: axis_inputs(x_name, "sweep_x")}
+    if z_name != "None":
+        axes[z_name] = axis_inputs(z_name, "sweep_z")
+
+    fixed = {}
+    with st.expander("Fixed Inputs"):
+        for name in names:
+            if name not in axes:
+                if name in INTEGER_PARAMS:
+                    fixed[name] = st.number_input(label(name), value=int(defaults[name]), step=1,
+                                                  key=f"sweep_fixed_{name}")
+                else:
+                    fixed[name] = st.number_input(label(name), value=float(defaults[name]), key=f"sweep_fixed_{name}")
+
+    cells = int(np.prod([len(v) for v in axes.values()]))
+    st.caption(f"{cells:,} cells")
+    if cells > MAX_CELLS:
+        st.error(f"The grid has {cells:,} cells; reduce the steps to at most {MAX_CELLS:,} cells in total.")
+        return
+
+    key = (metric, tuple((n, v.tobytes()) for n, v in axes.items()), tuple(sorted(fixed.items())))
+    if st.button("🚀 Run Sweep"):
+        with st.spinner(f"Evaluating {cells:,} cells..."):
+            st.session_state.sweep_result = (key, cached_run_sweep(metric, axes, fixed))
+
+    stored = st.session_state.get("sweep_result")
+    if stored is None or stored[0] != key:
+        return
+    render_result(stored[1], axes, metric, x_name, y_name, z_name)
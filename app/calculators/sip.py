@@ -2,7 +2,8 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 from utils.common import plot_investment_vs_return, format_inr
-from utils.export import generate_csv_download, generate_pdf_report
+from utils.export import export_options
+from core.sip import sip_curves
 
 def render():
     st.header("📈 SIP Calculator")
@@ -13,11 +14,11 @@ def render():
     return_rate = st.slider("Expected Return Rate (p.a. %)", 5.0, 20.0, 12.0)
 
     months = years * 12
-    monthly_rate = return_rate / 12 / 100
 
     # Future value calculation
-    future_value = monthly_investment * (((1 + monthly_rate) ** months - 1) * (1 + monthly_rate)) / monthly_rate
-    total_invested = monthly_investment * months
+    curves = sip_curves(monthly_investment, return_rate, months)
+    future_value = curves.final_value[0]
+    total_invested = curves.final_invested[0]
     total_returns = future_value - total_invested
 
     # Outputs
@@ -26,29 +27,20 @@ def render():
     st.info(f"Total Returns: {format_inr(total_returns)}")
 
     # Chart Data
-    dates = [datetime.today().replace(day=1) + pd.DateOffset(months=i) for i in range(months + 1)]
-    investment = [monthly_investment * i for i in range(months + 1)]
-    returns = [
-        monthly_investment * (((1 + monthly_rate) ** i - 1) * (1 + monthly_rate)) / monthly_rate
-        for i in range(months + 1)
-    ]
-
+    start = datetime.today().replace(day=1)
     df = pd.DataFrame({
-        "Date": dates,
-        "Investment": investment,
-        "Returns": returns
+        "Date": pd.date_range(start, periods=months + 1, freq="MS"),
+        "Investment": curves.invested[0],
+        "Returns": curves.value[0]
     })
 
     plot_investment_vs_return(df)
 
     # 🧾 Export Options
-    st.markdown("### 📤 Export Options")
-    generate_csv_download(df, filename="sip_schedule.csv")
-
     summary = {
         "Monthly SIP": format_inr(monthly_investment),
         "Return Rate": f"{return_rate}%",
         "Duration": f"{years} years",
         "Future Value": format_inr(future_value)
     }
-    generate_pdf_report(summary, filename="sip_summary.pdf")
+    export_options(df, "sip_schedule.csv", summary, "sip_summary.pdf")
@@ -2,7 +2,8 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 from utils.common import plot_investment_vs_return, format_inr
-from utils.export import generate_csv_download, generate_pdf_report
+from utils.export import export_options
+from core.step_up import step_up_curves
 
 def render():
     st.header("📈 Step-up SIP Calculator")
@@ -14,37 +15,20 @@ def render():
     return_rate = st.slider("Expected Return Rate (p.a. %)", 5.0, 20.0, 12.0)
 
     months = years * 12
-    monthly_rate = return_rate / 12 / 100
-    current_sip = monthly_investment
 
-    total_invested = 0
-    future_value = 0
-    investment = []
-    returns = []
-    dates = []
-
-    for i in range(months):
-        if i % 12 == 0 and i > 0:
-            current_sip *= (1 + step_up_percent / 100)
-
-        total_invested += current_sip
-        future_value = future_value * (1 + monthly_rate) + current_sip
-
-        dates.append(datetime.today().replace(day=1) + pd.DateOffset(months=i))
-        investment.append(total_invested)
-        returns.append(future_value)
+    investment, returns = step_up_curves(monthly_investment, step_up_percent, return_rate, years)
+    total_invested = investment[-1]
+    future_value = returns[-1]
 
     st.success(f"Future Value: {format_inr(future_value)}")
     st.info(f"Total Invested: {format_inr(total_invested)}")
     st.info(f"Total Returns: {format_inr(future_value - total_invested)}")
 
+    dates = pd.date_range(datetime.today().replace(day=1), periods=months, freq="MS")
     df = pd.DataFrame({"Date": dates, "Investment": investment, "Returns": returns})
     plot_investment_vs_return(df)
 
     # 🧾 Export Options
-    st.markdown("### 📤 Export Options")
-    generate_csv_download(df, filename="stepup_sip_schedule.csv")
-
     summary = {
         "Initial SIP": format_inr(monthly_investment),
         "Step-up": f"{step_up_percent}% annually",
@@ -52,4 +36,4 @@ def render():
         "Expected Return": f"{return_rate}%",
         "Future Value": format_inr(future_value)
     }
-    generate_pdf_report(summary, filename="stepup_sip_summary.pdf")
+    export_options(df, "stepup_sip_schedule.csv", summary, "stepup_sip_summary.pdf")
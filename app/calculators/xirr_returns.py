@@ -0,0 +1,81 @@
+import streamlit as st
+import pandas as pd
+from utils.common import format_inr
+from utils.export import export_options
+from utils.table import paged_table
+from core.xirr import xirr_batch
+
+LEDGER_COLUMNS = ["Folio", "Date", "Amount"]
+
+def load_ledger(source):
+    """Read a Folio / Date / Amount ledger from a CSV path or file object."""
+    df = pd.read_csv(source)
+    df.columns = [str(c).strip().title() for c in df.columns]
+    missing = set(LEDGER_COLUMNS) - set(df.columns)
+    if missing:
+        raise ValueError(f"Ledger is missing column(s): {', '.join(sorted(missing))}")
+    df = df[LEDGER_COLUMNS].dropna()
+    df["Date"] = pd.to_datetime(df["Date"])
+    df["Amount"] = df["Amount"].astype(float)
+    return df
+
+def ledger_xirr(df):
+    """XIRR and cash-flow totals for every folio in a ledger DataFrame."""
+    codes, folios = pd.factorize(df["Folio"])
+    result = xirr_batch(codes, df["Date"].to_numpy(), df["Amount"].to_numpy())
+    amounts = df["Amount"]
+    return pd.DataFrame({
+        "Folio": folios,
+        "Invested": (-amounts.clip(upper=0)).groupby(codes).sum().to_numpy(),
+        "Received": amounts.clip(lower=0).groupby(codes).sum().to_numpy(),
+        "Flows": amounts.groupby(codes).size().to_numpy(),
+        "XIRR (%)": result.root.round(2),
+        "Converged": result.converged,
+    })
+
+def render():
+    st.header("🧾 XIRR Returns Calculator")
+
+    st.write(
+        "Upload a cash-flow ledger with **Folio**, **Date** and **Amount** columns. "
+        "Investments are negative; redemptions and the current value are positive."
+    )
+
+    uploaded = st.file_uploader("Cash-flow Ledger (CSV)", type=["csv"])
+    if uploaded is not None:
+        try:
+            ledger = load_ledger(uploaded)
+        except ValueError as exc:
+            st.error(str(exc))
+            return
+    else:
+        st.caption("No file uploaded - edit the sample ledger below.")
+        sample = pd.DataFrame({
+            "Folio": ["Sample"] * 5,
+            "Date": pd.to_datetime(["2021-01-05", "2021-06-05", "2022-01-05", "2022-09-05", "2024-01-05"]),
+            "Amount": [-50000.0, -25000.0, -25000.0, 20000.0, 110000.0],
+        })
+        ledger = st.data_editor(sample, num_rows="dynamic", key="xirr_ledger").dropna()
+        ledger["Date"] = pd.to_datetime(ledger["Date"])
+
+    if ledger.empty:
+        st.warning("The ledger has no cash flows.")
+        return
+
+    results = ledger_xirr(ledger)
+
+    if len(results) == 1:
+        row = results.iloc[0]
+        if row["Converged"]:
+            st.success(f"XIRR: {row['XIRR (%)']:.2f}% p.a.")
+        else:
+            st.error("XIRR could not be computed: the ledger needs both investments and inflows.")
+        st.info(f"Total Invested: {format_inr(row['Invested'])}")
+        st.info(f"Total Received: {format_inr(row['Received'])}")
+    else:
+        solved = results["Converged"].sum()
+        st.success(f"Computed XIRR for {solved} of {len(results)} folios")
+        paged_table(results, "xirr_results_table", money_columns=("Invested", "Received"))
+
+    # 🧾 Export Options
+    export_options(results, "xirr_returns.csv")
@@ -0,0 +1,195 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from core.annuity import annuity_payment
+
+PREPAY_NONE, PREPAY_ONE_TIME, PREPAY_YEARLY, PREPAY_MONTHLY = 0, 1, 2, 3
+PREPAY_TYPES = {
+    "None": PREPAY_NONE,
+    "One-time": PREPAY_ONE_TIME,
+    "Yearly": PREPAY_YEARLY,
+    "Monthly": PREPAY_MONTHLY,
+}
+MAX_MONTHS = 1000
+
+
+@dataclass
+class AmortizationSchedule:
+    """Month-by-month schedules for a batch of loans, one row per loan.
+
+    Monthly arrays have shape (loans, months) and are zero-padded after a
+    loan is repaid; `tenure` gives the number of months actually used.
+    """
+    payment: np.ndarray     # instalment paid in the month (interest + principal)
+    interest: np.ndarray
+    principal: np.ndarray
+    prepayment: np.ndarray
+    balance: np.ndarray     # outstanding balance at the end of the month
+    installment: np.ndarray  # EMI in force at the end of the month
+    emi: np.ndarray         # (loans,) instalment in force at the end
+    tenure: np.ndarray      # (loans,) months until the balance reached zero
+
+    @property
+    def total_interest(self):
+        return self.interest.sum(axis=1)
+
+    @property
+    def total_paid(self):
+        return self.payment.sum(axis=1) + self.prepayment.sum(axis=1)
+
+
+def amortize_batch(principal, rate, months, prepay_type=PREPAY_NONE, prepay_amount=0.0,
+                   prepay_start=0, reduce_emi=False, max_months=MAX_MONTHS,
+                   start_month=0, opening_balance=None, opening_emi=None):
+    """
+    Build amortization schedules for many loans in one pass.
+
+    Every argument may be a scalar or an array with one entry per loan:
+    `rate` is the annual interest rate in %, `months` the original tenure,
+    `prepay_type` one of the PREPAY_* codes and `prepay_start` the first
+    month a prepayment is made. When `reduce_emi` is set the EMI is
+    recomputed over the remaining original tenure after each prepayment,
+    otherwise the EMI is kept and the tenure shrinks.
+
+    The loop runs over months only; all loans advance together as arrays.
+
+    To continue an existing schedule pass `start_month` (months already
+    paid) with the `opening_balance` and `opening_emi` at that point; the
+    returned arrays then cover months after `start_month` only.
+    """
+    arrays = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(principal, dtype=float)),
+        np.atleast_1d(np.asarray(rate, dtype=float)),
+        np.atleast_1d(np.asarray(months, dtype=np.int64)),
+        np.atleast_1d(np.asarray(prepay_type, dtype=np.int64)),
+        np.atleast_1d(np.asarray(prepay_amount, dtype=float)),
+        np.atleast_1d(np.asarray(prepay_start, dtype=np.int64)),
+        np.atleast_1d(np.asarray(reduce_emi, dtype=bool)),
+    )
+    principal, rate, months, prepay_type, prepay_amount, prepay_start, reduce_emi = arrays
+    n_loans = principal.shape[0]
+    monthly_rate = rate / 1200
+    horizon = int(min(max_months, months.max(initial=0)))
+    width = max(horizon - start_month, 0)
+
+    payment = np.zeros((n_loans, width))
+    interest = np.zeros((n_loans, width))
+    principal_paid = np.zeros((n_loans, width))
+    prepayment = np.zeros((n_loans, width))
+    balance = np.zeros((n_loans, width))
+    installment = np.zeros((n_loans, width))
+
+    if opening_balance is None:
+        outstanding = principal.copy()
+        emi = annuity_payment(principal, monthly_rate, months)
+    else:
+        outstanding = np.broadcast_to(np.asarray(opening_balance, dtype=float), principal.shape).copy()
+        emi = np.broadcast_to(np.asarray(opening_emi, dtype=float), principal.shape).copy()
+    tenure = np.zeros(n_loans, dtype=np.int64)
+    # Residues below this are floating-point noise, not money owed
+    settled = principal * 1e-9
+    prepays = prepay_type != PREPAY_NONE
+
+    for month in range(start_month + 1, horizon + 1):
+        active = outstanding > settled
+        if not active.any():
+            break
+        col = month - start_month - 1
+
+        month_interest = np.where(active, outstanding * monthly_rate, 0.0)
+        month_principal = np.where(active, np.minimum(emi - month_interest, outstanding), 0.0)
+        outstanding = outstanding - month_principal
+
+        since_start = month - prepay_start
+        due = prepays & active & (since_start >= 0) & (
+            (prepay_type == PREPAY_MONTHLY)
+            | ((prepay_type == PREPAY_YEARLY) & (since_start % 12 == 0))
+            | ((prepay_type == PREPAY_ONE_TIME) & (since_start == 0))
+        )
+        month_prepay = np.where(due, np.minimum(prepay_amount, outstanding), 0.0)
+        outstanding = outstanding - month_prepay
+        outstanding[outstanding <= settled] = 0.0
+
+        recompute = due & reduce_emi & (outstanding > 0)
+        if recompute.any():
+            remaining = np.maximum(months - month, 1)
+            emi = np.where(recompute, annuity_payment(outstanding, monthly_rate, remaining), emi)
+
+        payment[:, col] = month_interest + month_principal
+        interest[:, col] = month_interest
+        principal_paid[:, col] = month_principal
+        prepayment[:, col] = month_prepay
+        balance[:, col] = outstanding
+        installment[:, col] = emi
+        tenure[active] = month
+
+    used = max(int(tenure.max(initial=0)) - start_month, 0)
+    return AmortizationSchedule(
+        payment=payment[:, :used],
+        interest=interest[:, :used],
+        principal=principal_paid[:, :used],
+        prepayment=prepayment[:, :used],
+        balance=balance[:, :used],
+        installment=installment[:, :used],
+        emi=emi,
+        tenure=tenure,
+    )
+
+
+def first_changed_month(previous, current):
+    """
+    First month whose schedule can differ between two sets of single-loan
+    inputs, each given as the tuple
+    (principal, rate, months, prepay_type, prepay_amount, prepay_start, reduce_emi).
+
+    Returns 1 when the loan itself changed and None when nothing did.
+    Months before the first prepayment of either plan are identical.
+    """
+    if previous is None or tuple(previous[:3]) != tuple(current[:3]):
+        return 1
+    if tuple(previous) == tuple(current):
+        return None
+
+    def first_prepay(inputs):
+        prepay_type, _, prepay_start = inputs[3], inputs[4], inputs[5]
+        if prepay_type == PREPAY_NONE or (prepay_type == PREPAY_ONE_TIME and prepay_start < 1):
+            return np.inf
+        return max(prepay_start, 1)
+
+    return min(first_prepay(previous), first_prepay(current))
+
+
+def resume_batch(previous, from_month, principal, rate, months, prepay_type=PREPAY_NONE,
+                 prepay_amount=0.0, prepay_start=0, reduce_emi=False, max_months=MAX_MONTHS):
+    """
+    Recompute a schedule from `from_month` onwards, reusing the months
+    before it from `previous`, an AmortizationSchedule built from the
+    same loans. The balance and EMI checkpoints stored for each month
+    seed the recomputation, so only the changed suffix is simulated.
+    """
+    keep = int(min(max(from_month - 1, 0), previous.balance.shape[1]))
+    if keep == 0:
+        return amortize_batch(principal, rate, months, prepay_type, prepay_amount,
+                              prepay_start, reduce_emi, max_months)
+
+    tail = amortize_batch(
+        principal, rate, months, prepay_type, prepay_amount, prepay_start, reduce_emi,
+        max_months, start_month=keep,
+        opening_balance=previous.balance[:, keep - 1],
+        opening_emi=previous.installment[:, keep - 1],
+    )
+
+    def join(head, rest):
+        return np.concatenate([head[:, :keep], rest], axis=1)
+
+    return AmortizationSchedule(
+        payment=join(previous.payment, tail.payment),
+        interest=join(previous.interest, tail.interest),
+        principal=join(previous.principal, tail.principal),
+        prepayment=join(previous.prepayment, tail.prepayment),
+        balance=join(previous.balance, tail.balance),
+        installment=join(previous.installment, tail.installment),
+        emi=np.where(tail.tenure > 0, tail.emi, previous.emi),
+        tenure=np.where(tail.tenure > 0, tail.tenure, np.minimum(previous.tenure, keep)),
+    )
@@ -0,0 +1,109 @@
+import numpy as np
+
+from core.roots import newton_bracketed
+
+
+def annuity_payment(principal, monthly_rate, months):
+    """
+    Level monthly instalment that repays `principal` over `months` months:
+    EMI = [P * r * (1 + r)^N] / [(1 + r)^N – 1]
+    Works element-wise on arrays; a zero rate falls back to P / N.
+    """
+    principal, monthly_rate, months = np.broadcast_arrays(
+        np.asarray(principal, dtype=float),
+        np.asarray(monthly_rate, dtype=float),
+        np.asarray(months, dtype=float),
+    )
+    growth = np.expm1(months * np.log1p(monthly_rate))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        emi = principal * monthly_rate * (growth + 1) / growth
+        flat = principal / months
+    return np.where(monthly_rate == 0, flat, emi)
+
+
+def annuity_principal(payment, monthly_rate, months):
+    """
+    Principal that `payment` a month repays over `months` months:
+    P = EMI * [(1 + r)^N – 1] / [r * (1 + r)^N]
+    """
+    payment, monthly_rate, months = np.broadcast_arrays(
+        np.asarray(payment, dtype=float),
+        np.asarray(monthly_rate, dtype=float),
+        np.asarray(months, dtype=float),
+    )
+    decay = -np.expm1(-months * np.log1p(monthly_rate))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        principal = payment * decay / monthly_rate
+    return np.where(monthly_rate == 0, payment * months, principal)
+
+
+def annuity_balance(balance, monthly_rate, payment, months):
+    """
+    Outstanding balance after paying `payment` for `months` months:
+    B_k = B * (1 + r)^k – EMI * [(1 + r)^k – 1] / r
+    """
+    balance, monthly_rate, payment, months = np.broadcast_arrays(
+        np.asarray(balance, dtype=float),
+        np.asarray(monthly_rate, dtype=float),
+        np.asarray(payment, dtype=float),
+        np.asarray(months, dtype=float),
+    )
+    growth = np.expm1(months * np.log1p(monthly_rate))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        remaining = balance * (growth + 1) - payment * growth / monthly_rate
+    return np.where(monthly_rate == 0, balance - payment * months, remaining)
+
+
+def months_to_repay(balance, monthly_rate, payment):
+    """
+    Fractional number of months `payment` needs to clear `balance`:
+    N = log(EMI / (EMI – B * r)) / log(1 + r)
+    Returns inf where the payment does not cover the monthly interest.
+    """
+    balance, monthly_rate, payment = np.broadcast_arrays(
+        np.asarray(balance, dtype=float),
+        np.asarray(monthly_rate, dtype=float),
+        np.asarray(payment, dtype=float),
+    )
+    ratio = balance * monthly_rate / payment
+    with np.errstate(divide="ignore", invalid="ignore"):
+        months = -np.log1p(-np.minimum(ratio, 1.0)) / np.log1p(monthly_rate)
+        flat = balance / payment
+    months = np.where(monthly_rate == 0, flat, months)
+    return np.where((ratio >= 1) | (payment <= 0), np.inf, months)
+
+
+def solve_rate(principal, payment, months, tol=1e-12, max_iter=100):
+    """
+    Annual interest rate (in %) at which `payment` a month repays
+    `principal` over `months` months, for arrays of loans.
+
+    Uses Newton's method on the EMI formula with its analytic derivative,
+    falling back to bisection inside [0, 1200%]. Returns a RootResult
+    whose `converged` flags loans without a valid rate (for instance an
+    EMI that never repays the principal).
+    """
+    principal, payment, months = (
+        a.astype(float) for a in np.broadcast_arrays(
+            np.atleast_1d(principal), np.atleast_1d(payment), np.atleast_1d(months)
+        )
+    )
+
+    def emi_gap(r, idx):
+        P, A, n = principal[idx], payment[idx], months[idx]
+        discount = np.exp(-n * np.log1p(r))
+        denom = -np.expm1(-n * np.log1p(r))
+        gap = P * r / denom - A
+        slope = P * (denom - r * n * discount / (1 + r)) / denom ** 2
+        small = r < 1e-9
+        gap = np.where(small, P / n * (1 + r * (n + 1) / 2) - A, gap)
+        slope = np.where(small, P * (n + 1) / (2 * n), slope)
+        return gap, slope
+
+    # A*n ≈ P*(1 + r*(n+1)/2) for small r, and A ≈ P*r for long tenures
+    with np.errstate(divide="ignore", invalid="ignore"):
+        guess = np.minimum(2 * (months * payment - principal) / (principal * (months + 1)),
+                           payment / principal)
+    result = newton_bracketed(emi_gap, 0.0, 1.0, np.nan_to_num(guess), tol=tol, max_iter=max_iter)
+    result.root = result.root * 1200
+    return result
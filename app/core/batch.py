@@ -0,0 +1,212 @@
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from core.amortization import MAX_MONTHS, PREPAY_NONE, PREPAY_TYPES
+from core.floating import amortize_floating
+from core.goals import required_sip
+from core.loans import LoanTerms, summarize_loans
+from core.lumpsum import lumpsum_future_value
+from core.retirement import future_value
+from core.sip import sip_future_value
+from core.step_up import step_up_future_value, step_up_invested
+
+
+@dataclass(frozen=True)
+class Kernel:
+    """A calculation run over whole columns of scenarios at once."""
+    func: object        # module-level function of the input columns -> dict of output columns
+    inputs: tuple       # required input columns
+    outputs: tuple
+    defaults: dict      # optional input columns and their values when absent
+    checks: tuple = ()  # Check rules every scenario must pass
+
+
+@dataclass(frozen=True)
+class Check:
+    """A domain rule on one input column, e.g. that an amount is positive."""
+    field: str
+    message: str
+    valid: object       # function of the parsed input columns -> bool array
+
+
+class InvalidScenario(ValueError):
+    """An input outside a kernel's domain; `row` is 0-based within the call."""
+
+    def __init__(self, field, message, row):
+        super().__init__(f"'{field}' {message}")
+        self.field = field
+        self.row = row
+
+
+def _positive(*fields):
+    return tuple(Check(f, "must be greater than 0", lambda p, f=f: p[f] > 0) for f in fields)
+
+
+def _non_negative(*fields):
+    return tuple(Check(f, "must not be negative", lambda p, f=f: p[f] >= 0) for f in fields)
+
+
+def _loan_years(*fields):
+    # EMI, schedule and tenure are all computed on whole months
+    return tuple(check for f in fields for check in (
+        Check(f, "must be a whole number of months (years x 12)",
+              lambda p, f=f: np.isclose(p[f] * 12, np.round(p[f] * 12), rtol=0, atol=1e-6)),
+        Check(f, f"must be at most {MAX_MONTHS // 12} years", lambda p, f=f: np.round(p[f] * 12) <= MAX_MONTHS),
+    ))
+
+
+def _one_of(field, codes):
+    return (Check(field, f"must be one of {', '.join(map(str, codes))}", lambda p: np.isin(p[field], codes)),)
+
+
+def _greater(field, other):
+    return (Check(field, f"must be greater than '{other}'", lambda p: p[field] > p[other]),)
+
+
+def _months(years):
+    return np.round(years * 12)
+
+
+def sip(amount, rate, years):
+    value = sip_future_value(amount, rate, years * 12)
+    invested = amount * years * 12
+    return {"future_value": value, "invested": invested, "gain": value - invested}
+
+
+def step_up_sip(amount, step_up, rate, years):
+    value = step_up_future_value(amount, step_up, rate, years)
+    invested = step_up_invested(amount, step_up, years)
+    return {"future_value": value, "invested": invested, "gain": value - invested}
+
+
+def lumpsum(amount, rate, years):
+    value = lumpsum_future_value(amount, rate, years)
+    return {"future_value": value, "gain": value - amount}
+
+
+def emi(principal, rate, years, prepay_type, prepay_amount, prepay_start, reduce_emi):
+    months = _months(years)
+    schedule = amortize_floating(
+        principal, rate, months.astype(np.int64),
+        prepay_type=prepay_type.astype(np.int64), prepay_amount=prepay_amount,
+        prepay_start=prepay_start.astype(np.int64), reduce_emi=reduce_emi.astype(bool),
+    )
+    return {
+        "emi": summarize_loans(LoanTerms(principal, rate, months)).emi,
+        "tenure_months": schedule.tenure,
+        "total_interest": schedule.total_interest,
+        "total_paid": schedule.total_paid,
+    }
+
+
+def loan_comparison(principal_a, rate_a, years_a, principal_b, rate_b, years_b):
+    a = summarize_loans(LoanTerms(principal_a, rate_a, _months(years_a)))
+    b = summarize_loans(LoanTerms(principal_b, rate_b, _months(years_b)))
+    return {
+        "emi_a": a.emi, "emi_b": b.emi,
+        "total_interest_a": a.total_interest, "total_interest_b": b.total_interest,
+        "interest_saved_by_b": a.total_interest - b.total_interest,
+    }
+
+
+def retirement(current_age, retirement_age, post_retire_age, expense, inflation, returns):
+    years_to_retire = retirement_age - current_age
+    annual_expense = expense * 12 * (1 + inflation / 100) ** years_to_retire
+    corpus = future_value(annual_expense, returns, post_retire_age - retirement_age)
+    return {
+        "years_to_retire": years_to_retire,
+        "fire_corpus": expense * 12 * 30,
+        "corpus_required": corpus,
+        "monthly_sip_needed": required_sip(corpus, returns, years_to_retire * 12),
+    }
+
+
+KERNELS = {
+    "sip": Kernel(sip, ("amount", "rate", "years"), ("future_value", "invested", "gain"), {},
+                  _positive("amount", "years") + _non_negative("rate")),
+    "step_up_sip": Kernel(step_up_sip, ("amount", "step_up", "rate", "years"),
+                          ("future_value", "invested", "gain"), {},
+                          _positive("amount", "years") + _non_negative("step_up", "rate")),
+    "lumpsum": Kernel(lumpsum, ("amount", "rate", "years"), ("future_value", "gain"), {},
+                      _positive("amount", "years") + _non_negative("rate")),
+    "emi": Kernel(emi, ("principal", "rate", "years"), ("emi", "tenure_months", "total_interest", "total_paid"), {
+        "prepay_type": PREPAY_NONE, "prepay_amount": 0.0, "prepay_start": 12, "reduce_emi": 0,
+    }, _positive("principal", "years") + _non_negative("rate", "prepay_amount", "prepay_start") + _loan_years("years")
+       + _one_of("prepay_type", sorted(PREPAY_TYPES.values())) + _one_of("reduce_emi", [0, 1])),
+    "loan_comparison": Kernel(loan_comparison, ("principal_a", "rate_a", "years_a", "principal_b", "rate_b", "years_b"),
+                              ("emi_a", "emi_b", "total_interest_a", "total_interest_b", "interest_saved_by_b"), {},
+                              _positive("principal_a", "years_a", "principal_b", "years_b")
+                              + _non_negative("rate_a", "rate_b") + _loan_years("years_a", "years_b")),
+    "retirement": Kernel(retirement, ("current_age", "retirement_age", "post_retire_age", "expense", "inflation", "returns"),
+                         ("years_to_retire", "fire_corpus", "corpus_required", "monthly_sip_needed"), {},
+                         _non_negative("current_age", "inflation", "returns") + _positive("expense")
+                         + _greater("retirement_age", "current_age") + _greater("post_retire_age", "retirement_age")),
+}
+
+# Columns that may also be given by name, e.g. prepay_type "Yearly"
+NAMED_VALUES = {"prepay_type": PREPAY_TYPES}
+
+
+def parse_column(name, values):
+    """Float array from the raw values of input column `name`; a blank or null value is an InvalidScenario."""
+    names = NAMED_VALUES.get(name, {})
+    values = [names.get(v, v) for v in values] if names else list(values)
+    for row, value in enumerate(values):
+        if value is None or value == "":
+            raise InvalidScenario(name, "is missing", row)
+    try:
+        return np.array(values, dtype=float)
+    except (ValueError, TypeError):
+        for row, value in enumerate(values):
+            try:
+                float(value)
+            except (ValueError, TypeError):
+                raise InvalidScenario(name, f"must be a number, got {value!r}", row) from None
+        raise
+
+
+def validate(name, params):
+    """Raise InvalidScenario for the first scenario outside kernel `name`'s domain."""
+    for column, values in params.items():
+        bad = np.flatnonzero(~np.isfinite(values))
+        if bad.size:
+            raise InvalidScenario(column, "must be a finite number", int(bad[0]))
+    for check in KERNELS[name].checks:
+        bad = np.flatnonzero(~check.valid(params))
+        if bad.size:
+            raise InvalidScenario(check.field, check.message, int(bad[0]))
+
+
+def run_kernel(name, columns):
+    """
+    Outputs of kernel `name` for `columns`, a dict of input column -> raw
+    values (strings or numbers). Missing optional columns take the
+    kernel's defaults. Raises InvalidScenario for a blank, non-numeric or
+    out-of-domain input.
+    """
+    kernel = KERNELS[name]
+    size = len(next(iter(columns.values()))) if columns else 0
+    params = {column: parse_column(column, columns[column]) for column in kernel.inputs}
+    for column, default in kernel.defaults.items():
+        params[column] = parse_column(column, columns[column]) if column in columns else np.full(size, float(default))
+    validate(name, params)
+    outputs = kernel.func(**params)
+    return {column: np.broadcast_to(np.asarray(outputs[column], dtype=float), size) for column in kernel.outputs}
+
+
+def output_rows(outputs, decimals=2):
+    """
+    One dict per scenario from run_kernel outputs, rounded to `decimals`,
+    with whole numbers as ints and NaN or infinite values as None, ready
+    for JSON or CSV.
+    """
+    columns = {name: [_number(v) for v in np.round(values, decimals).tolist()] for name, values in outputs.items()}
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+def _number(value):
+    if not math.isfinite(value):
+        return None
+    return int(value) if value.is_integer() else value
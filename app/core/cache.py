@@ -0,0 +1,222 @@
+import dataclasses
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Set to a directory to keep cached results across restarts
+CACHE_DIR_ENV = "FINCALC_CACHE_DIR"
+
+_CACHES = {}
+
+
+@dataclasses.dataclass
+class CacheStats:
+    hits: int
+    misses: int
+    disk_hits: int      # misses in memory that were served from disk
+    entries: int
+    bytes: int
+
+
+class MemoCache:
+    """
+    Thread-safe LRU cache of computed results, bounded by entry count and
+    by the approximate size of the NumPy arrays it holds, with an optional
+    on-disk tier of pickled results that survives restarts. Disk entries
+    are never evicted; remove the directory to reclaim the space.
+    """
+
+    def __init__(self, name, maxsize=128, max_bytes=256 * 2**20, directory=None):
+        # Names label the stats; a second cache under a taken name (a
+        # reloaded module, another service instance) gets a numbered one
+        self.name = name
+        number = 2
+        while self.name in _CACHES:
+            self.name = f"{name} ({number})"
+            number += 1
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.directory = os.path.join(directory, name) if directory else None
+        self._entries = OrderedDict()   # key -> (value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.disk_hits = 0
+        _CACHES[self.name] = self
+
+    def get(self, key):
+        """Return (True, value) for a cached key, else (False, None)."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key][0]
+            self.misses += 1
+        if self.directory:
+            try:
+                with open(self._path(key), "rb") as f:
+                    value = pickle.load(f)
+            except FileNotFoundError:
+                return False, None
+            except Exception:
+                # Truncated, or pickled by code that has since changed
+                # (a renamed class or module): a miss, and not worth keeping
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+                return False, None
+            with self._lock:
+                self.disk_hits += 1
+            self._remember(key, value)
+            return True, value
+        return False, None
+
+    def set(self, key, value):
+        self._remember(key, value)
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write then rename so readers never see a partial file
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.disk_hits = 0
+
+    def stats(self):
+        with self._lock:
+            return CacheStats(self.hits, self.misses, self.disk_hits, len(self._entries), self._bytes)
+
+    def _remember(self, key, value):
+        size = _nbytes(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.maxsize or self._bytes > self.max_bytes:
+                self._bytes -= self._entries.popitem(last=False)[1][1]
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+
+def memoize(name=None, maxsize=128, max_bytes=256 * 2**20, directory=None, version=None):
+    """
+    Cache a pure function's results across calls, sessions and threads.
+
+    Arguments are normalized before hashing: numbers compare by value
+    (8 and 8.0 are the same key), arrays by dtype, shape and contents,
+    and dataclasses by their fields. The disk tier defaults to the
+    FINCALC_CACHE_DIR environment variable. Cached results are shared
+    between callers and must not be mutated. The wrapper exposes
+    `.cache` for stats and clearing.
+
+    Keys include `version`, by default a hash of the source of the
+    function's module and of the whole `core` package, so editing the
+    formulas or result dataclasses stops old disk entries from being
+    served. Pass an explicit `version` and bump it when a change outside
+    those files alters the results.
+    """
+    def decorate(func):
+        cache = MemoCache(name or f"{func.__module__}.{func.__qualname__}", maxsize, max_bytes,
+                          directory or os.environ.get(CACHE_DIR_ENV))
+        code_version = version if version is not None else source_version(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = make_key((code_version,) + args, kwargs)
+            found, value = cache.get(key)
+            if found:
+                return value
+            value = func(*args, **kwargs)
+            cache.set(key, value)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+    return decorate
+
+
+def make_key(args, kwargs):
+    """Stable hex digest of normalized call arguments."""
+    normalized = (_normalize(args), _normalize(sorted(kwargs.items())))
+    return hashlib.sha256(pickle.dumps(normalized, protocol=4)).hexdigest()
+
+
+def source_version(func):
+    """
+    Short hash of the source file defining `func` (or of its bytecode if
+    there is none) and of every module of the `core` package, which the
+    cached calculations build on.
+    """
+    digest = hashlib.sha256(func.__code__.co_code)
+    try:
+        with open(inspect.getsourcefile(func), "rb") as f:
+            digest.update(f.read())
+    except (OSError, TypeError):
+        pass
+    digest.update(_core_digest())
+    return digest.hexdigest()[:16]
+
+
+@functools.lru_cache(maxsize=None)
+def _core_digest():
+    digest = hashlib.sha256()
+    core = os.path.dirname(os.path.abspath(__file__))
+    for name in sorted(os.listdir(core)):
+        if name.endswith(".py"):
+            with open(os.path.join(core, name), "rb") as f:
+                digest.update(name.encode() + b"\0" + f.read())
+    return digest.digest()
+
+
+def cache_stats():
+    """CacheStats for every cache, by name."""
+    return {name: cache.stats() for name, cache in _CACHES.items()}
+
+
+def _normalize(value):
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value)
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind in "iuf":
+            value = value.astype(float)
+        return ("ndarray", value.dtype.str, value.shape, np.ascontiguousarray(value).tobytes())
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return (type(value).__qualname__, _normalize(dataclasses.astuple(value)))
+    if isinstance(value, dict):
+        return ("dict", tuple((k, _normalize(v)) for k, v in sorted(value.items())))
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(v) for v in value)
+    return value
+
+
+def _nbytes(value):
+    """Approximate memory held by NumPy arrays and bytes inside a result."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return sum(_nbytes(getattr(value, f.name)) for f in dataclasses.fields(value))
+    if isinstance(value, (list, tuple)):
+        return sum(_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sum(_nbytes(v) for v in value.values())
+    return 64
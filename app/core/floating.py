@@ -0,0 +1,200 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from core.amortization import (
+    MAX_MONTHS, PREPAY_NONE, PREPAY_ONE_TIME, PREPAY_YEARLY, PREPAY_MONTHLY,
+)
+from core.annuity import annuity_payment, annuity_balance, months_to_repay
+
+RESET_RECOMPUTE_EMI, RESET_EXTEND_TENURE = 0, 1
+RESET_MODES = {
+    "Recompute EMI": RESET_RECOMPUTE_EMI,
+    "Extend Tenure": RESET_EXTEND_TENURE,
+}
+
+
+@dataclass
+class FloatingSchedule:
+    """Event-level result of amortize_floating, one row per loan.
+
+    Each segment is a stretch between two events (rate reset or
+    prepayment) during which the rate and EMI stay constant. Segment
+    arrays have shape (loans, segments) and are NaN-padded.
+    """
+    tenure: np.ndarray          # months until repaid (or max_months if capped)
+    total_interest: np.ndarray
+    total_paid: np.ndarray      # EMIs plus prepayments
+    total_prepaid: np.ndarray
+    emi: np.ndarray             # EMI in force at the end
+    outstanding: np.ndarray     # balance left if the loan hit max_months
+    segment_start: np.ndarray   # first month of the segment
+    segment_rate: np.ndarray    # annual rate in %
+    segment_emi: np.ndarray
+    segment_balance: np.ndarray  # balance at the start of the segment
+
+
+def amortize_floating(principal, rate, months, reset_months=None, reset_rates=None,
+                      reset_mode=RESET_RECOMPUTE_EMI, prepay_type=PREPAY_NONE,
+                      prepay_amount=0.0, prepay_start=0, reduce_emi=False,
+                      max_months=MAX_MONTHS):
+    """
+    Amortize floating-rate loans by jumping from one event to the next.
+
+    `rate` is the starting annual rate in %. `reset_months` and
+    `reset_rates` are (loans, resets) arrays - or 1-D arrays shared by
+    every loan - giving the month from which each new rate applies; pad
+    shorter schedules with NaN rates. At a reset the EMI is recomputed
+    over the remaining original tenure (RESET_RECOMPUTE_EMI) or kept so
+    the tenure moves instead (RESET_EXTEND_TENURE). If a kept EMI no
+    longer covers the interest it is recomputed anyway.
+
+    Prepayment arguments follow amortize_batch. Between events balances
+    advance with the closed-form annuity formula, so the cost grows with
+    the number of events rather than the number of months; monthly
+    prepayments still make every month an event.
+    """
+    principal, rate, months, prepay_type, prepay_amount, prepay_start, reduce_emi, reset_mode = (
+        np.broadcast_arrays(
+            np.atleast_1d(np.asarray(principal, dtype=float)),
+            np.atleast_1d(np.asarray(rate, dtype=float)),
+            np.atleast_1d(np.asarray(months, dtype=np.int64)),
+            np.atleast_1d(np.asarray(prepay_type, dtype=np.int64)),
+            np.atleast_1d(np.asarray(prepay_amount, dtype=float)),
+            np.atleast_1d(np.asarray(prepay_start, dtype=np.int64)),
+            np.atleast_1d(np.asarray(reduce_emi, dtype=bool)),
+            np.atleast_1d(np.asarray(reset_mode, dtype=np.int64)),
+        )
+    )
+    n_loans = principal.shape[0]
+    loans = np.arange(n_loans)
+
+    if reset_months is None:
+        reset_months, reset_rates = np.empty((n_loans, 0)), np.empty((n_loans, 0))
+    reset_rates = np.broadcast_to(np.atleast_2d(np.asarray(reset_rates, dtype=float)), (n_loans, np.shape(reset_rates)[-1]))
+    reset_months = np.broadcast_to(np.atleast_2d(np.asarray(reset_months, dtype=float)), reset_rates.shape)
+    # Events happen at month boundaries: a rate that applies from month m
+    # is set once month m - 1 has been paid.
+    reset_at = np.where(np.isnan(reset_rates) | np.isnan(reset_months), np.inf, reset_months - 1)
+    order = np.argsort(reset_at, axis=1, kind="stable")
+    reset_at = np.take_along_axis(reset_at, order, axis=1)
+    reset_rates = np.take_along_axis(reset_rates, order, axis=1)
+    reset_at = np.append(reset_at, np.full((n_loans, 1), np.inf), axis=1)
+    n_resets = reset_rates.shape[1]
+
+    monthly_rate = rate / 1200
+    balance = principal.copy()
+    emi = annuity_payment(balance, monthly_rate, months)
+    elapsed = np.zeros(n_loans, dtype=np.int64)
+    tenure = np.zeros(n_loans, dtype=np.int64)
+    total_paid = np.zeros(n_loans)
+    total_interest = np.zeros(n_loans)
+    total_prepaid = np.zeros(n_loans)
+    active = balance > 0
+    settled = principal * 1e-9
+    next_reset = np.zeros(n_loans, dtype=np.int64)
+    step = np.select([prepay_type == PREPAY_MONTHLY, prepay_type == PREPAY_YEARLY], [1, 12], 0)
+    # Prepayments are made after a month's EMI, so month 1 is the earliest
+    late = np.maximum(1 - prepay_start, 0)
+    recurring = prepay_start + step * -(-late // np.maximum(step, 1))
+    next_prepay = np.select(
+        [step > 0, (prepay_type == PREPAY_ONE_TIME) & (prepay_start >= 1)],
+        [recurring, prepay_start], np.inf,
+    )
+
+    segments = [(np.ones(n_loans), rate.copy(), emi.copy(), balance.copy())]
+
+    with np.errstate(invalid="ignore", over="ignore"):
+        while active.any():
+            reset_boundary = reset_at[loans, next_reset]
+            boundary = np.minimum(np.minimum(reset_boundary, next_prepay), max_months)
+            boundary = np.maximum(boundary, elapsed)
+            span = np.where(active, boundary - elapsed, 0).astype(np.int64)
+
+            # Loans that are repaid before the next event finish inside the span
+            payoff = months_to_repay(balance, monthly_rate, emi)
+            last = np.ceil(payoff - 1e-9)
+            finishes = active & (last <= span)
+            full = np.where(finishes, last - 1, 0)
+            before_last = annuity_balance(balance, monthly_rate, emi, full)
+            final_paid = emi * full + before_last * (1 + monthly_rate)
+
+            after_span = annuity_balance(balance, monthly_rate, emi, span)
+            span_paid = emi * span
+            paid = np.where(finishes, final_paid, np.where(active, span_paid, 0.0))
+            reduction = np.where(finishes, balance, np.where(active, balance - after_span, 0.0))
+            total_paid += paid
+            total_interest += paid - reduction
+            tenure = np.where(finishes, elapsed + last, tenure).astype(np.int64)
+            balance = np.where(finishes, 0.0, np.where(active, after_span, balance))
+            elapsed = np.where(active, elapsed + span, elapsed)
+            active &= ~finishes
+
+            capped = active & (elapsed >= max_months)
+            tenure = np.where(capped, max_months, tenure)
+            active &= ~capped
+            if not active.any():
+                break
+
+            is_reset = np.zeros(n_loans, dtype=bool)
+            while True:
+                hit = active & (reset_at[loans, next_reset] == elapsed)
+                if not hit.any():
+                    break
+                monthly_rate = np.where(hit, reset_rates[loans, np.minimum(next_reset, n_resets - 1)] / 1200, monthly_rate)
+                next_reset += hit
+                is_reset |= hit
+
+            is_prepay = active & (next_prepay == elapsed)
+            prepaid = np.where(is_prepay, np.minimum(prepay_amount, balance), 0.0)
+            balance = balance - prepaid
+            total_paid += prepaid
+            total_prepaid += prepaid
+            next_prepay = np.where(is_prepay, np.where(step > 0, next_prepay + step, np.inf), next_prepay)
+
+            cleared = active & (balance <= settled)
+            tenure = np.where(cleared, elapsed, tenure)
+            balance = np.where(cleared, 0.0, balance)
+            active &= ~cleared
+
+            recompute = active & (
+                (is_reset & (reset_mode == RESET_RECOMPUTE_EMI))
+                | (is_prepay & reduce_emi)
+                | (is_reset & (emi <= balance * monthly_rate))
+            )
+            if recompute.any():
+                remaining = np.maximum(months - elapsed, 1)
+                emi = np.where(recompute, annuity_payment(balance, monthly_rate, remaining), emi)
+
+            changed = active & (is_reset | recompute)
+            if changed.any():
+                segments.append((
+                    np.where(changed, elapsed + 1, np.nan),
+                    np.where(changed, monthly_rate * 1200, np.nan),
+                    np.where(changed, emi, np.nan),
+                    np.where(changed, balance, np.nan),
+                ))
+
+    segment_start, segment_rate, segment_emi, segment_balance = (
+        _compact(np.column_stack([seg[i] for seg in segments])) for i in range(4)
+    )
+    return FloatingSchedule(
+        tenure=tenure,
+        total_interest=total_interest,
+        total_paid=total_paid,
+        total_prepaid=total_prepaid,
+        emi=emi,
+        outstanding=balance,
+        segment_start=segment_start,
+        segment_rate=segment_rate,
+        segment_emi=segment_emi,
+        segment_balance=segment_balance,
+    )
+
+
+def _compact(columns):
+    """Shift the non-NaN entries of each row to the left."""
+    order = np.argsort(np.isnan(columns), axis=1, kind="stable")
+    packed = np.take_along_axis(columns, order, axis=1)
+    width = int((~np.isnan(columns)).sum(axis=1).max(initial=0))
+    return packed[:, :width]
@@ -0,0 +1,60 @@
+import numpy as np
+
+from core.lumpsum import lumpsum_future_value
+from core.retirement import future_value
+from core.roots import newton_bracketed
+from core.sip import sip_future_value
+from core.step_up import step_up_future_value
+
+
+def required_sip(target, rate, months):
+    """Monthly SIP that grows to `target` in `months` months at `rate` % p.a."""
+    return np.asarray(target, dtype=float) / sip_future_value(1.0, rate, months)
+
+
+def required_step_up_sip(target, step_up, rate, years):
+    """Starting monthly SIP that reaches `target` when stepped up `step_up` % a year."""
+    return np.asarray(target, dtype=float) / step_up_future_value(1.0, step_up, rate, years)
+
+
+def required_lumpsum(target, rate, years):
+    """Amount to invest today so it compounds to `target` in `years` years."""
+    return np.asarray(target, dtype=float) / lumpsum_future_value(1.0, rate, years)
+
+
+def required_annual_saving(target, rate, years):
+    """Yearly saving that builds `target` by retirement, per retirement_planner.future_value."""
+    return np.asarray(target, dtype=float) / future_value(1.0, rate, years)
+
+
+def required_sip_rate(target, amount, months, tol=1e-12, max_iter=100):
+    """
+    Annual return (in %) a SIP of `amount` needs to reach `target` in
+    `months` months. No closed form exists, so all goals are solved
+    together with the bracketed Newton solver using the derivative
+    dFV/dr = P * [n * (1 + r)^n / r – ((1 + r)^n – 1) / r^2].
+    Returns a RootResult; goals outside 0–1200% are not converged.
+    """
+    target, amount, months = (
+        a.astype(float) for a in np.broadcast_arrays(
+            np.atleast_1d(target), np.atleast_1d(amount), np.atleast_1d(months)
+        )
+    )
+
+    def gap(r, idx):
+        P, n = amount[idx], months[idx]
+        growth = np.exp(n * np.log1p(r))
+        value = P * (growth - 1) * (1 + r) / r
+        slope = P * (n * growth / r - (growth - 1) / r ** 2)
+        small = r < 1e-7
+        value = np.where(small, P * n * (1 + r * (n + 1) / 2), value)
+        slope = np.where(small, P * n * (n + 1) / 2, slope)
+        return value - target[idx], slope
+
+    # FV ≈ P * n * (1 + r * (n + 1) / 2) for small r
+    with np.errstate(divide="ignore", invalid="ignore"):
+        guess = 2 * (target / (amount * months) - 1) / (months + 1)
+    result = newton_bracketed(gap, 0.0, 1.0, np.nan_to_num(guess), tol=tol, max_iter=max_iter)
+    result.root = result.root * 1200
+    return result
+
@@ -0,0 +1,53 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from core.annuity import annuity_payment, annuity_principal, months_to_repay, solve_rate
+
+
+@dataclass(frozen=True)
+class LoanTerms:
+    """Fixed-rate loans; scalars or arrays that broadcast together."""
+    principal: np.ndarray
+    rate: np.ndarray            # annual rate in %
+    months: np.ndarray
+
+
+@dataclass
+class LoanSummary:
+    """Repayment totals for each loan in a LoanTerms."""
+    emi: np.ndarray
+    total_payment: np.ndarray
+    total_interest: np.ndarray
+
+
+def loan_emi(principal, rate, months):
+    """Monthly EMI for `principal` at `rate` % p.a. over `months` months."""
+    return annuity_payment(principal, np.asarray(rate, dtype=float) / 1200, months)
+
+
+def loan_principal(emi, rate, months):
+    """Loan amount that `emi` a month repays at `rate` % p.a. over `months` months."""
+    return annuity_principal(emi, np.asarray(rate, dtype=float) / 1200, months)
+
+
+def loan_tenure(principal, emi, rate):
+    """Fractional months `emi` needs to repay `principal`; inf if it never does."""
+    return months_to_repay(principal, np.asarray(rate, dtype=float) / 1200, emi)
+
+
+def loan_rate(principal, emi, months):
+    """Annual rate in % turning `principal` into `emi` over `months`; NaN if none does."""
+    return solve_rate(principal, emi, months).root
+
+
+def summarize_loans(terms: LoanTerms) -> LoanSummary:
+    """EMI, total payment and total interest for every loan in `terms`."""
+    principal, rate, months = np.broadcast_arrays(
+        np.asarray(terms.principal, dtype=float),
+        np.asarray(terms.rate, dtype=float),
+        np.asarray(terms.months, dtype=float),
+    )
+    emi = loan_emi(principal, rate, months)
+    total_payment = emi * months
+    return LoanSummary(emi=emi, total_payment=total_payment, total_interest=total_payment - principal)
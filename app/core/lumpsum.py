@@ -0,0 +1,6 @@
+import numpy as np
+
+
+def lumpsum_future_value(amount, rate, years):
+    """Value of `amount` compounded annually at `rate` % p.a. for `years` years."""
+    return np.asarray(amount, dtype=float) * (1 + np.asarray(rate, dtype=float) / 100) ** np.asarray(years, dtype=float)
@@ -0,0 +1,122 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from core.parallel import map_chunks
+
+CHUNK_PATHS = 25_000
+
+
+@dataclass(frozen=True)
+class RetirementScenario:
+    """Inputs for a stochastic retirement simulation; rates are in % p.a."""
+    current_age: int
+    retirement_age: int
+    end_age: int
+    monthly_expense: float      # in today's money
+    current_savings: float = 0.0
+    monthly_saving: float = 0.0
+    saving_step_up: float = 0.0
+    mean_return: float = 10.0
+    return_volatility: float = 12.0
+    mean_inflation: float = 6.0
+    inflation_volatility: float = 1.5
+
+
+@dataclass
+class MonteCarloResult:
+    """Year-end corpus percentiles across the simulated paths, in nominal rupees.
+
+    `bands` has shape (len(q), years + 1): row i is the q[i]-th percentile
+    by age; column 0 is today and column `retirement_index` is the corpus
+    on the retirement date.
+    """
+    ages: np.ndarray
+    q: tuple
+    bands: np.ndarray
+    success_probability: float  # share of paths whose money lasted until end_age
+    retirement_index: int
+
+    @property
+    def retirement_percentiles(self):
+        """Corpus percentiles on the retirement date, one per q."""
+        return self.bands[:, self.retirement_index]
+
+
+def simulate_retirement(scenario, n_paths=100_000, seed=0, q=(10, 50, 90), workers=None, chunk_paths=CHUNK_PATHS):
+    """
+    Simulate `n_paths` yearly paths of random returns and inflation
+    through saving until retirement and spending until `end_age`, and
+    reduce them to the corpus percentiles `q` by age and the success rate.
+
+    Gross returns are lognormal with the given mean and volatility,
+    inflation is normal. Before retirement the corpus grows and receives
+    a year of savings (stepped up yearly); afterwards the inflated
+    expense is withdrawn at the start of each year, and a path fails
+    once it cannot cover it.
+
+    Paths are split into fixed-size chunks, each with its own child of
+    `seed`, so results depend only on the seed and chunk size - not on
+    how many processes run them. Chunks go to the shared process pool
+    when `workers` (default: one per CPU) is above one. The paths
+    themselves are dropped once reduced, so only the bands are kept.
+    """
+    sizes = [chunk_paths] * (n_paths // chunk_paths)
+    if n_paths % chunk_paths:
+        sizes.append(n_paths % chunk_paths)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    chunks = map_chunks(_simulate_chunk, [(scenario, s, n) for s, n in zip(seeds, sizes)], workers)
+
+    corpus = [c for c, _ in chunks]
+    survivors = sum(alive for _, alive in chunks)
+    del chunks
+    years = scenario.end_age - scenario.current_age
+    # One age at a time, so no (paths, years + 1) array beyond the chunks' own is built
+    bands = np.empty((len(q), years + 1))
+    for year in range(years + 1):
+        bands[:, year] = np.percentile(np.concatenate([c[year] for c in corpus]), q)
+    return MonteCarloResult(
+        ages=np.arange(scenario.current_age, scenario.end_age + 1),
+        q=tuple(q),
+        bands=bands,
+        success_probability=survivors / n_paths,
+        retirement_index=scenario.retirement_age - scenario.current_age,
+    )
+
+
+def _simulate_chunk(task):
+    scenario, seed, n = task
+    rng = np.random.default_rng(seed)
+    saving_years = scenario.retirement_age - scenario.current_age
+    years = scenario.end_age - scenario.current_age
+
+    mean = scenario.mean_return / 100
+    vol = scenario.return_volatility / 100
+    # Lognormal gross return with the requested arithmetic mean and volatility
+    sigma2 = np.log1p((vol / (1 + mean)) ** 2)
+    log_returns = rng.normal(np.log1p(mean) - sigma2 / 2, np.sqrt(sigma2), (n, years))
+    growth = np.exp(log_returns)
+    inflation = np.maximum(
+        rng.normal(scenario.mean_inflation / 100, scenario.inflation_volatility / 100, (n, years)), -0.5
+    )
+    prices = np.cumprod(1 + inflation, axis=1)
+
+    # Ages on the first axis, so each age's values are contiguous for the reduction
+    corpus = np.empty((years + 1, n), dtype=np.float32)
+    wealth = np.full(n, float(scenario.current_savings))
+    corpus[0] = wealth
+    alive = np.ones(n, dtype=bool)
+    saving = scenario.monthly_saving * 12
+    expense = scenario.monthly_expense * 12
+
+    for year in range(years):
+        if year < saving_years:
+            wealth = wealth * growth[:, year] + saving * (1 + scenario.saving_step_up / 100) ** year
+        else:
+            price = prices[:, year - 1] if year > 0 else 1.0
+            wealth = wealth - expense * price
+            alive &= wealth >= 0
+            wealth = np.maximum(wealth, 0.0) * growth[:, year]
+        corpus[year + 1] = wealth
+
+    return corpus, int(alive.sum())
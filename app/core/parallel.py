@@ -0,0 +1,82 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+_POOLS = {}
+_LOCK = threading.Lock()
+
+
+def cpu_workers():
+    return os.cpu_count() or 1
+
+
+def get_pool(workers):
+    """
+    Process pool of `workers` processes, started on first use and shared
+    by later calls so reruns do not pay the start-up cost again. Workers
+    are spawned rather than forked, which is safe from threaded servers.
+    """
+    with _LOCK:
+        pool = _POOLS.get(workers)
+        if pool is None:
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _POOLS[workers] = pool
+        return pool
+
+
+def map_chunks(func, chunks, workers=None):
+    """
+    Apply `func` to every item of `chunks` and return the results in
+    order. Runs in the shared process pool when more than one worker is
+    requested (default: one per CPU) and in-process otherwise. `func`
+    must be a module-level function so it can be pickled.
+    """
+    chunks = list(chunks)
+    workers = min(workers or cpu_workers(), len(chunks))
+    if workers <= 1:
+        return [func(chunk) for chunk in chunks]
+    try:
+        return list(get_pool(workers).map(func, chunks))
+    except BrokenProcessPool:
+        with _LOCK:
+            _POOLS.pop(workers, None)
+        raise
+
+
+def imap_chunks(func, chunks, workers=None, window=None):
+    """
+    Lazy, ordered map_chunks for long streams: `chunks` is consumed only
+    as results are taken, with at most `window` chunks (default: two per
+    worker) in flight, so memory stays bounded whatever the input size.
+    """
+    workers = workers or cpu_workers()
+    if workers <= 1:
+        yield from map(func, chunks)
+        return
+    pool = get_pool(workers)
+    window = window or 2 * workers
+    pending = deque()
+    try:
+        for chunk in chunks:
+            pending.append(pool.submit(func, chunk))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    except BrokenProcessPool:
+        with _LOCK:
+            _POOLS.pop(workers, None)
+        raise
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+@atexit.register
+def _shutdown():
+    for pool in _POOLS.values():
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,100 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from core.amortization import PREPAY_ONE_TIME, PREPAY_YEARLY, PREPAY_MONTHLY
+from core.floating import amortize_floating
+
+OBJECTIVES = ("interest", "tenure")
+
+
+@dataclass
+class PrepaymentPlans:
+    """Evaluated prepayment strategies, best first."""
+    prepay_type: np.ndarray
+    prepay_amount: np.ndarray
+    prepay_start: np.ndarray
+    total_interest: np.ndarray
+    tenure: np.ndarray
+    total_prepaid: np.ndarray
+    candidates: int     # strategies in the search space
+    feasible: int       # strategies within the cash budget
+    evaluated: int      # strategies left after pruning dominated ones
+
+
+def affordable(prepay_type, prepay_amount, prepay_start, months, initial_cash, monthly_surplus):
+    """
+    Whether each strategy's cumulative prepayments stay within the cash
+    available, `initial_cash` plus `monthly_surplus` per month elapsed.
+    Both sides grow linearly from one prepayment to the next, so checking
+    the first and the last possible prepayment is enough.
+    """
+    spacing = np.select(
+        [prepay_type == PREPAY_YEARLY, prepay_type == PREPAY_MONTHLY], [12, 1], 0
+    )
+    count = np.where(spacing > 0, (months - prepay_start) // np.maximum(spacing, 1), 0)
+    last_month = prepay_start + spacing * count
+    first_ok = prepay_amount <= initial_cash + monthly_surplus * prepay_start
+    last_ok = prepay_amount * (count + 1) <= initial_cash + monthly_surplus * last_month
+    return (prepay_start <= months) & first_ok & last_ok
+
+
+def optimize_prepayment(principal, rate, months, initial_cash, monthly_surplus, amounts,
+                        starts, types=(PREPAY_ONE_TIME, PREPAY_YEARLY, PREPAY_MONTHLY), objective="interest"):
+    """
+    Search prepayment strategies for one loan - every combination of
+    `types`, `amounts` and `starts` - that respect the cash budget, and
+    rank them by total interest or tenure.
+
+    Plans keep the EMI and shorten the tenure. Under the same budget a
+    reduce-EMI plan prepays the same cash but repays principal more
+    slowly, so it never beats its reduce-tenure twin on interest or tenure.
+
+    Dominated strategies are dropped before any schedule is built:
+    - for a given type and start only the largest affordable amount is
+      kept, since prepaying more never costs more interest or time;
+    - for a given type and amount only the earliest start is kept.
+    The survivors are evaluated together in one amortize_floating call.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"objective must be one of {OBJECTIVES}")
+
+    grid = np.meshgrid(
+        np.asarray(types, dtype=np.int64), np.asarray(amounts, dtype=float),
+        np.asarray(starts, dtype=np.int64), indexing="ij",
+    )
+    prepay_type, amount, start = (g.ravel() for g in grid)
+    candidates = prepay_type.size
+
+    keep = affordable(prepay_type, amount, start, months, initial_cash, monthly_surplus) & (amount > 0)
+    feasible = int(keep.sum())
+    prepay_type, amount, start = prepay_type[keep], amount[keep], start[keep]
+
+    # Largest affordable amount per (type, start)
+    order = np.lexsort((-amount, start, prepay_type))
+    _, first = np.unique(np.column_stack([prepay_type[order], start[order]]), axis=0, return_index=True)
+    pick = order[first]
+    # Earliest start per (type, amount)
+    order = pick[np.lexsort((start[pick], amount[pick], prepay_type[pick]))]
+    _, first = np.unique(np.column_stack([prepay_type[order], amount[order]]), axis=0, return_index=True)
+    pick = order[first]
+
+    prepay_type, amount, start = prepay_type[pick], amount[pick], start[pick]
+    result = amortize_floating(
+        principal, rate, months, prepay_type=prepay_type, prepay_amount=amount, prepay_start=start,
+    )
+
+    primary = result.total_interest if objective == "interest" else result.tenure
+    secondary = result.tenure if objective == "interest" else result.total_interest
+    rank = np.lexsort((result.total_prepaid, secondary, primary))
+    return PrepaymentPlans(
+        prepay_type=prepay_type[rank],
+        prepay_amount=amount[rank],
+        prepay_start=start[rank],
+        total_interest=result.total_interest[rank],
+        tenure=result.tenure[rank],
+        total_prepaid=result.total_prepaid[rank],
+        candidates=candidates,
+        feasible=feasible,
+        evaluated=int(pick.size),
+    )
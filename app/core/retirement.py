@@ -0,0 +1,19 @@
+import numpy as np
+
+
+def future_value(pmt, rate, n):
+    """Value of `pmt` saved at the end of each year for `n` years at `rate` % p.a."""
+    pmt, rate, n = np.broadcast_arrays(
+        np.asarray(pmt, dtype=float), np.asarray(rate, dtype=float), np.asarray(n, dtype=float)
+    )
+    r = rate / 100
+    growth = np.expm1(n * np.log1p(r))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = pmt * growth / r
+    return np.where(r == 0, pmt * n, value)
+
+
+def corpus_needed(expense, inflation, years):
+    """30x the inflated annual expense after `years` years."""
+    adjusted_expense = np.asarray(expense, dtype=float) * (1 + np.asarray(inflation, dtype=float) / 100) ** years
+    return adjusted_expense * 12 * 30  # 30x rule
@@ -0,0 +1,76 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class RootResult:
+    """Element-wise outcome of a vectorized root search."""
+    root: np.ndarray        # NaN where no root was found
+    converged: np.ndarray   # bool per element
+    iterations: np.ndarray  # iterations used per element
+
+
+def newton_bracketed(func, lower, upper, guess, tol=1e-12, max_iter=100):
+    """
+    Find roots of many scalar equations at once.
+
+    `func(x, idx)` must return the pair (f, df/dx) evaluated at `x` for
+    the equations selected by the integer index array `idx`. Each
+    equation needs a bracket [lower, upper] over which f changes sign;
+    equations without one are reported as not converged. Newton steps
+    are used while they stay inside the shrinking bracket and bisection
+    otherwise, or when a step fails to halve the one before it (as in
+    Numerical Recipes' rtsafe), so every element converges at least
+    linearly.
+    """
+    lower, upper, guess = (
+        a.astype(float).copy() for a in np.broadcast_arrays(
+            np.atleast_1d(lower), np.atleast_1d(upper), np.atleast_1d(guess)
+        )
+    )
+    size = lower.shape[0]
+    everything = np.arange(size)
+    root = np.full(size, np.nan)
+    converged = np.zeros(size, dtype=bool)
+    iterations = np.zeros(size, dtype=np.int64)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        f_lower, _ = func(lower, everything)
+        f_upper, _ = func(upper, everything)
+        at_lower, at_upper = f_lower == 0, f_upper == 0
+        root[at_lower], root[at_upper] = lower[at_lower], upper[at_upper]
+        converged |= at_lower | at_upper
+
+        bracketed = ~converged & (np.sign(f_lower) * np.sign(f_upper) < 0)
+        idx = np.flatnonzero(bracketed)
+        lo, hi, lo_sign = lower[idx], upper[idx], np.sign(f_lower[idx])
+        x = np.clip(guess[idx], lo, hi)
+        x = np.where((x <= lo) | (x >= hi), 0.5 * (lo + hi), x)
+        last_step = hi - lo
+
+        for step in range(1, max_iter + 1):
+            if idx.size == 0:
+                break
+            f, df = func(x, idx)
+            same = np.sign(f) == lo_sign
+            lo = np.where(same, x, lo)
+            hi = np.where(same, hi, x)
+
+            newton = x - f / df
+            bisect = 0.5 * (lo + hi)
+            slow = np.abs(newton - x) > 0.5 * np.abs(last_step)
+            outside = ~np.isfinite(newton) | (newton <= lo) | (newton >= hi) | slow
+            nxt = np.where(outside, bisect, newton)
+            last_step = nxt - x
+
+            done = (f == 0) | (np.abs(nxt - x) <= tol * (1 + np.abs(x))) | (hi - lo <= tol * (1 + np.abs(x)))
+            root[idx[done]] = np.where(f[done] == 0, x[done], nxt[done])
+            converged[idx[done]] = True
+            iterations[idx] = step
+
+            keep = ~done
+            idx, x, lo, hi, lo_sign = idx[keep], nxt[keep], lo[keep], hi[keep], lo_sign[keep]
+            last_step = last_step[keep]
+
+    return RootResult(root=root, converged=converged, iterations=iterations)
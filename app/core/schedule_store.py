@@ -0,0 +1,250 @@
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from core.amortization import PREPAY_NONE, amortize_batch
+
+# Monthly columns kept for every loan, besides the 1-based month offset
+COLUMNS = ("payment", "interest", "principal", "prepayment", "balance")
+MONTH_DTYPE = np.int16      # tenures are capped at MAX_MONTHS
+CHUNK_LOANS = 2_000
+
+_META = "meta.json"
+_IDS = "loan_ids.txt"
+
+
+class ScheduleWriter:
+    """
+    Appends amortization schedules to an on-disk store: one flat binary
+    file per column, rows of each loan back to back, and a row offset and
+    start month per loan. The metadata is written on close, so readers
+    never see loans whose rows are only partly written.
+
+    Opening an existing store adds to it; its float dtype is kept. Used as
+    a context manager, a writer that exits on an error writes no metadata:
+    an existing store stays as it was last closed, a new one is removed.
+    """
+
+    def __init__(self, path, dtype="float64"):
+        self.path = path
+        self._created = not os.path.exists(path)
+        os.makedirs(path, exist_ok=True)
+        meta = _read_meta(path) if os.path.exists(os.path.join(path, _META)) else None
+        self._new = meta is None
+        self.dtype = np.dtype(meta["dtype"] if meta else dtype)
+        if self.dtype not in (np.float32, np.float64):
+            raise ValueError(f"Schedule values must be float32 or float64, not {self.dtype}")
+        self.loans = meta["loans"] if meta else 0
+        self.rows = meta["rows"] if meta else 0
+        self._ids = set(_read_ids(path, self.loans)) if meta else set()
+        # Drop anything past the last close, e.g. from a writer that crashed
+        mode = "r+b" if meta else "wb"
+        self._files = {}
+        for name, itemsize, size in _files(self.dtype, self.loans, self.rows):
+            f = open(os.path.join(path, name), mode if os.path.exists(os.path.join(path, name)) else "wb")
+            f.truncate(size * itemsize)
+            f.seek(0, os.SEEK_END)
+            self._files[name] = f
+        ids = open(os.path.join(path, _IDS), "a+" if meta else "w", encoding="utf-8", newline="\n")
+        if meta:
+            ids.seek(0)
+            keep = sum(len(line.encode("utf-8")) for _, line in zip(range(self.loans), ids))
+            ids.truncate(keep)
+        self._files[_IDS] = ids
+
+    def add(self, loan_ids, schedule, start=None):
+        """
+        Append every loan of an AmortizationSchedule, trimmed to its tenure.
+        `start` is the month before each loan's first payment, as
+        numpy datetime64[M] values; it defaults to the Unix epoch.
+        """
+        loan_ids = [str(loan_id) for loan_id in loan_ids]
+        tenure = np.asarray(schedule.tenure, dtype=np.int64)
+        if len(loan_ids) != len(tenure):
+            raise ValueError(f"{len(loan_ids)} loan IDs for {len(tenure)} schedules")
+        for loan_id in loan_ids:
+            if loan_id in self._ids:
+                raise ValueError(f"Loan ID {loan_id!r} is already in the store")
+            if "\n" in loan_id:
+                raise ValueError(f"Loan ID {loan_id!r} contains a newline")
+        if len(set(loan_ids)) < len(loan_ids):
+            raise ValueError("Loan IDs must be unique")
+        self._ids.update(loan_ids)
+
+        width = schedule.balance.shape[1]
+        used = np.arange(width) < tenure[:, None]
+        month = np.broadcast_to(np.arange(1, width + 1, dtype=MONTH_DTYPE), used.shape)
+        month[used].tofile(self._files["month.bin"])
+        for column in COLUMNS:
+            getattr(schedule, column)[used].astype(self.dtype).tofile(self._files[f"{column}.bin"])
+
+        ends = self.rows + np.cumsum(tenure)
+        ends.tofile(self._files["row_end.bin"])
+        start = np.broadcast_to(np.asarray(0 if start is None else start, dtype="datetime64[M]"), tenure.shape)
+        start.astype(np.int64).tofile(self._files["start.bin"])
+        self._files[_IDS].write("".join(f"{loan_id}\n" for loan_id in loan_ids))
+        self.loans += len(loan_ids)
+        self.rows = int(ends[-1]) if len(ends) else self.rows
+
+    def close(self):
+        self._close_files()
+        meta = {"version": 1, "dtype": self.dtype.name, "loans": self.loans, "rows": self.rows}
+        tmp = os.path.join(self.path, _META + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(self.path, _META))
+
+    def discard(self):
+        """Close without recording what was added since the last close."""
+        self._close_files()
+        if self._new:
+            for name in self._files:
+                try:
+                    os.remove(os.path.join(self.path, name))
+                except FileNotFoundError:
+                    pass
+            if self._created:
+                shutil.rmtree(self.path, ignore_errors=True)
+
+    def _close_files(self):
+        for f in self._files.values():
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+class ScheduleStore:
+    """
+    Read-only view of a store written by ScheduleWriter. Columns are
+    memory-mapped, so opening is instant and a loan's schedule is a
+    zero-copy slice; only the pages actually read come off the disk.
+    """
+
+    def __init__(self, path):
+        meta = _read_meta(path)
+        self.path = path
+        self.dtype = np.dtype(meta["dtype"])
+        self.rows = meta["rows"]
+        self.loan_ids = _read_ids(path, meta["loans"])
+        self.index = {loan_id: i for i, loan_id in enumerate(self.loan_ids)}
+        self._maps = {}
+        for name, itemsize, size in _files(self.dtype, meta["loans"], self.rows):
+            dtype = {"month.bin": MONTH_DTYPE, "row_end.bin": np.int64, "start.bin": np.int64}.get(name, self.dtype)
+            # np.memmap refuses empty files
+            self._maps[name[:-4]] = (np.memmap(os.path.join(path, name), dtype=dtype, mode="r", shape=(size,))
+                                     if size else np.empty(0, dtype=dtype))
+        self.row_end = self._maps["row_end"]
+        self.start = self._maps["start"].view("datetime64[M]")
+
+    def __len__(self):
+        return len(self.loan_ids)
+
+    def __contains__(self, loan_id):
+        return str(loan_id) in self.index
+
+    def rows_of(self, loan_id):
+        """Slice of the store's rows that hold `loan_id`; KeyError if absent."""
+        i = self.index[str(loan_id)]
+        return slice(int(self.row_end[i - 1]) if i else 0, int(self.row_end[i]))
+
+    def column(self, name):
+        """A whole column ("month" or one of COLUMNS) across all loans, memory-mapped."""
+        return self._maps[name]
+
+    def schedule(self, loan_id):
+        """Column name -> that loan's monthly values, as views into the store."""
+        rows = self.rows_of(loan_id)
+        return {name: self._maps[name][rows] for name in ("month",) + COLUMNS}
+
+    def dates(self, loan_id):
+        """Payment months of `loan_id` as datetime64[M]."""
+        return self.start[self.index[str(loan_id)]] + self.schedule(loan_id)["month"]
+
+    def totals(self, name):
+        """Per-loan sum of column `name`, in store order."""
+        if not len(self.row_end):
+            return np.zeros(0)
+        starts = np.concatenate([[0], self.row_end[:-1]]).astype(np.int64)
+        column = self._maps[name]
+        if not len(column):
+            return np.zeros(len(starts))
+        sums = np.add.reduceat(column, np.minimum(starts, len(column) - 1), dtype=np.float64)
+        # reduceat yields the value at the start, not 0, for loans with no rows
+        return np.where(starts < self.row_end, sums, 0.0)
+
+
+def write_schedules(path, loan_ids, principal, rate, months, prepay_type=PREPAY_NONE, prepay_amount=0.0,
+                    prepay_start=0, reduce_emi=False, start=None, dtype="float64", chunk_loans=CHUNK_LOANS,
+                    replace=False):
+    """
+    Amortize a book of loans into the store at `path`, `chunk_loans` at a
+    time so memory stays bounded however large the book is. Arguments
+    follow amortize_batch, one entry per loan in `loan_ids`.
+
+    Loans are added to an existing store unless `replace` is set; then
+    the book is written to a new directory beside it that is swapped in
+    only once complete, so readers see either the old store or the new.
+    """
+    loan_ids = list(loan_ids)
+    arrays = np.broadcast_arrays(principal, rate, months, prepay_type, prepay_amount, prepay_start,
+                                 reduce_emi, np.asarray(0 if start is None else start, dtype="datetime64[M]"),
+                                 np.empty(len(loan_ids)))
+    target = path
+    if replace:
+        parent, name = os.path.split(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        target = tempfile.mkdtemp(prefix=f".{name}.new-", dir=parent)
+    try:
+        with ScheduleWriter(target, dtype) as writer:
+            for lo in range(0, len(loan_ids), chunk_loans):
+                part = [a[lo:lo + chunk_loans] for a in arrays]
+                writer.add(loan_ids[lo:lo + chunk_loans], amortize_batch(*part[:7]), start=part[7])
+    except BaseException:
+        if replace:
+            shutil.rmtree(target, ignore_errors=True)
+        raise
+    if replace:
+        _swap_in(target, path)
+    return ScheduleStore(path)
+
+
+def _swap_in(new, path):
+    # A directory cannot be renamed over a non-empty one: move the old
+    # store aside first, then delete it once the new one is in place
+    old = None
+    if os.path.exists(path):
+        old = tempfile.mkdtemp(prefix=f".{os.path.basename(path)}.old-", dir=os.path.dirname(os.path.abspath(path)))
+        os.replace(path, os.path.join(old, "store"))
+    os.replace(new, path)
+    if old:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def _files(dtype, loans, rows):
+    """(file name, item size, item count) for every binary file of a store."""
+    return [("month.bin", np.dtype(MONTH_DTYPE).itemsize, rows)] + [
+        (f"{column}.bin", dtype.itemsize, rows) for column in COLUMNS
+    ] + [("row_end.bin", 8, loans), ("start.bin", 8, loans)]
+
+
+def _read_meta(path):
+    with open(os.path.join(path, _META)) as f:
+        meta = json.load(f)
+    if meta.get("version") != 1:
+        raise ValueError(f"Unsupported schedule store version: {meta.get('version')}")
+    return meta
+
+
+def _read_ids(path, loans):
+    with open(os.path.join(path, _IDS), encoding="utf-8", newline="\n") as f:
+        return [line.rstrip("\n") for _, line in zip(range(loans), f)]
@@ -0,0 +1,114 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class SipCurves:
+    """Month-by-month SIP projections, one row per plan.
+
+    Arrays have shape (plans, months + 1); column i is the position after
+    i instalments and entries past a plan's own tenure are NaN.
+    """
+    invested: np.ndarray
+    value: np.ndarray
+
+    @property
+    def final_value(self):
+        return _last(self.value)
+
+    @property
+    def final_invested(self):
+        return _last(self.invested)
+
+
+def sip_future_value(amount, rate, months):
+    """
+    Value of a SIP of `amount` a month at `rate` % p.a. after `months`
+    instalments, each invested at the start of its month:
+    FV = P * [((1 + r)^n – 1) / r] * (1 + r)
+    """
+    amount, rate, months = np.broadcast_arrays(
+        np.asarray(amount, dtype=float), np.asarray(rate, dtype=float), np.asarray(months, dtype=float)
+    )
+    r = rate / 1200
+    growth = np.expm1(months * np.log1p(r))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = amount * growth * (1 + r) / r
+    return np.where(r == 0, amount * months, value)
+
+
+def sip_curves(amount, rate, months):
+    """
+    Invested amount and value after every month for arrays of
+    (monthly amount, annual rate %, tenure in months) in one shot.
+
+    The cumulative growth factors (1 + r)^i for all plans and months are
+    built as a single (plans, months + 1) array and the annuity formula
+    is applied to it element-wise.
+    """
+    amount, rate, months = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(amount, dtype=float)),
+        np.atleast_1d(np.asarray(rate, dtype=float)),
+        np.atleast_1d(np.asarray(months, dtype=np.int64)),
+    )
+    r = (rate / 1200)[:, None]
+    steps = np.arange(int(months.max(initial=0)) + 1)
+    growth = np.expm1(np.log1p(r) * steps)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = amount[:, None] * growth * (1 + r) / r
+    value = np.where(r == 0, amount[:, None] * steps, value)
+    invested = amount[:, None] * steps
+
+    beyond = steps > months[:, None]
+    value[beyond] = np.nan
+    invested[beyond] = np.nan
+    return SipCurves(invested=invested, value=value)
+
+
+def sip_path_curves(amount, monthly_returns, monthly_inflation=None):
+    """
+    Nominal and real SIP value curves along time-varying paths.
+
+    `monthly_returns` and `monthly_inflation` hold decimal per-month
+    rates with months on the last axis (leading axes are plans or
+    scenarios). Instalments are made at the start of each month, as in
+    sip_future_value. With G_t the cumulative growth factor after t
+    months the nominal value is
+    V_t = P * G_t * Σ_{j<=t} 1 / G_{j-1}
+    and the real value is V_t divided by the cumulative price index.
+    Both come from cumulative products and sums in one pass; column 0
+    is the position before the first instalment.
+    """
+    returns = np.asarray(monthly_returns, dtype=float)
+    amount = np.asarray(amount, dtype=float)[..., None]
+    zeros = np.zeros(returns.shape[:-1] + (1,))
+
+    log_growth = np.concatenate([zeros, np.cumsum(np.log1p(returns), axis=-1)], axis=-1)
+    growth = np.exp(log_growth)
+    contributions = np.concatenate([zeros, np.cumsum(np.exp(-log_growth[..., :-1]), axis=-1)], axis=-1)
+    nominal = amount * growth * contributions
+
+    if monthly_inflation is None:
+        return nominal, nominal.copy()
+    inflation = np.asarray(monthly_inflation, dtype=float)
+    prices = np.exp(np.concatenate([zeros, np.cumsum(np.log1p(inflation), axis=-1)], axis=-1))
+    return nominal, nominal / prices
+
+
+def annual_to_monthly(returns, inflation, repeat=12):
+    """
+    Convert annual rates in % to per-month decimal rates: returns the
+    repo's way (rate / 12), inflation so that 12 months compound to the
+    annual figure. Each entry is repeated `repeat` times, so year-by-year
+    paths expand to months; pass repeat=1 for month-by-month paths.
+    """
+    monthly_returns = np.repeat(np.asarray(returns, dtype=float) / 1200, repeat, axis=-1)
+    monthly_inflation = np.repeat(np.expm1(np.log1p(np.asarray(inflation, dtype=float) / 100) / 12), repeat, axis=-1)
+    return monthly_returns, monthly_inflation
+
+
+def _last(curve):
+    """Last non-NaN entry of each row."""
+    filled = (~np.isnan(curve)).sum(axis=1) - 1
+    return curve[np.arange(curve.shape[0]), filled]
@@ -0,0 +1,82 @@
+import numpy as np
+
+
+def _ratio_series(log_ratio, count):
+    """(x^count – 1) / (x – 1) for x = exp(log_ratio), stable as x → 1."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        series = np.expm1(count * log_ratio) / np.expm1(log_ratio)
+    return np.where(log_ratio == 0, count, series)
+
+
+def _year_inputs(amount, step_up, rate):
+    amount = np.asarray(amount, dtype=float)
+    step = np.log1p(np.asarray(step_up, dtype=float) / 100)
+    monthly = np.log1p(np.asarray(rate, dtype=float) / 1200)
+    # Value at the end of a year of 12 instalments of 1, each invested at
+    # the end of its month
+    year_block = _ratio_series(monthly, 12)
+    return amount, step, monthly, year_block
+
+
+def step_up_future_value(amount, step_up, rate, years):
+    """
+    Value after `years` years of a SIP starting at `amount` a month that
+    grows by `step_up` % every year, at `rate` % p.a. compounded monthly.
+
+    Each year's 12 instalments form a block worth S_k * a at year end,
+    where S_k = amount * (1 + g)^k; compounding the blocks to the end is
+    a geometric series in q / (1 + g) with q = (1 + r)^12:
+    FV = amount * a * (1 + g)^(Y-1) * [(q / (1 + g))^Y – 1] / [q / (1 + g) – 1]
+
+    All arguments broadcast, so grids of step-up, rate and duration are
+    evaluated in one call.
+    """
+    amount, step, monthly, year_block = _year_inputs(amount, step_up, rate)
+    years = np.asarray(years, dtype=float)
+    value = amount * year_block * np.exp((years - 1) * step) * _ratio_series(12 * monthly - step, years)
+    return np.where(years > 0, value, 0.0)
+
+
+def step_up_invested(amount, step_up, years):
+    """Total contributed: 12 * amount * [(1 + g)^Y – 1] / g."""
+    step = np.log1p(np.asarray(step_up, dtype=float) / 100)
+    return 12 * np.asarray(amount, dtype=float) * _ratio_series(step, np.asarray(years, dtype=float))
+
+
+def step_up_checkpoints(amount, step_up, rate, years):
+    """
+    Invested amount and value at the end of every year, as two arrays of
+    shape broadcast(inputs) + (max_years + 1,); column y is the position
+    after y years and entries past a plan's own duration are NaN.
+    """
+    years = np.asarray(years, dtype=np.int64)
+    steps = np.arange(int(years.max(initial=0)) + 1)
+    expand = lambda a: np.asarray(a, dtype=float)[..., None]
+    value = step_up_future_value(expand(amount), expand(step_up), expand(rate), steps)
+    invested = step_up_invested(expand(amount), expand(step_up), steps)
+    beyond = steps > years[..., None]
+    value, invested = np.broadcast_arrays(value, invested)
+    value, invested = np.where(beyond, np.nan, value), np.where(beyond, np.nan, invested)
+    return invested, value
+
+
+def step_up_curves(amount, step_up, rate, years):
+    """
+    Month-by-month invested amount and value for one or more plans, with
+    column i the position after i + 1 instalments. Built from the yearly
+    checkpoints, so no month is simulated.
+    """
+    invested, value = step_up_checkpoints(amount, step_up, rate, years)
+    amount, step, monthly, _ = _year_inputs(amount, step_up, rate)
+    n_years = invested.shape[-1] - 1
+
+    year = np.arange(n_years)
+    into_year = np.arange(1, 13)
+    sip = (amount[..., None] * np.exp(step[..., None] * year))[..., None]
+    growth = np.exp(monthly[..., None, None] * into_year)
+    block = _ratio_series(monthly[..., None, None], into_year)
+
+    monthly_value = value[..., :-1, None] * growth + sip * block
+    monthly_invested = invested[..., :-1, None] + sip * into_year
+    shape = monthly_value.shape[:-2] + (n_years * 12,)
+    return monthly_invested.reshape(shape), monthly_value.reshape(shape)
@@ -0,0 +1,95 @@
+import numpy as np
+
+from core.amortization import PREPAY_NONE
+from core.floating import amortize_floating
+from core.parallel import map_chunks
+from core.retirement import future_value
+from core.sip import sip_future_value
+from core.step_up import step_up_future_value
+
+CHUNK_CELLS = 100_000
+# Codes and month counts: swept and fixed values are rounded to whole numbers
+INTEGER_PARAMS = {"prepay_type", "prepay_start", "reduce_emi"}
+
+
+def sip_value(amount, rate, years):
+    return sip_future_value(amount, rate, years * 12)
+
+
+def step_up_value(amount, step_up, rate, years):
+    return step_up_future_value(amount, step_up, rate, years)
+
+
+def retirement_corpus(expense, inflation, returns, years_to_retire, years_post_retire):
+    annual_expense = expense * 12 * (1 + inflation / 100) ** years_to_retire
+    return future_value(annual_expense, returns, years_post_retire)
+
+
+def _loan(principal, rate, years, prepay_amount, prepay_type, prepay_start, reduce_emi):
+    return amortize_floating(
+        principal, rate, (years * 12).astype(np.int64),
+        prepay_type=prepay_type.astype(np.int64), prepay_amount=prepay_amount,
+        prepay_start=prepay_start.astype(np.int64), reduce_emi=reduce_emi.astype(bool),
+    )
+
+
+def loan_interest(principal, rate, years, prepay_amount, prepay_type, prepay_start, reduce_emi):
+    return _loan(principal, rate, years, prepay_amount, prepay_type, prepay_start, reduce_emi).total_interest
+
+
+def loan_tenure(principal, rate, years, prepay_amount, prepay_type, prepay_start, reduce_emi):
+    return _loan(principal, rate, years, prepay_amount, prepay_type, prepay_start, reduce_emi).tenure
+
+
+_LOAN_DEFAULTS = {
+    "principal": 2500000.0, "rate": 8.5, "years": 20, "prepay_amount": 0.0,
+    "prepay_type": PREPAY_NONE, "prepay_start": 12, "reduce_emi": 0,
+}
+
+# Metric name -> (vectorized function, default value of every parameter)
+METRICS = {
+    "SIP Future Value": (sip_value, {"amount": 10000.0, "rate": 12.0, "years": 20}),
+    "Step-up SIP Future Value": (step_up_value, {"amount": 10000.0, "step_up": 10.0, "rate": 12.0, "years": 20}),
+    "Retirement Corpus Required": (retirement_corpus, {
+        "expense": 30000.0, "inflation": 6.0, "returns": 10.0, "years_to_retire": 35, "years_post_retire": 25,
+    }),
+    "Home Loan Total Interest": (loan_interest, _LOAN_DEFAULTS),
+    "Home Loan Tenure (months)": (loan_tenure, _LOAN_DEFAULTS),
+}
+
+
+def run_sweep(metric, axes, fixed=None, chunk_cells=CHUNK_CELLS, workers=None):
+    """
+    Evaluate `metric` (a METRICS key) on the full grid spanned by `axes`,
+    a dict of parameter name -> 1-D array of values. Parameters that are
+    not swept take their value from `fixed`, then from the defaults.
+
+    The flattened grid is cut into chunks of `chunk_cells` cells that run
+    in the shared process pool; each chunk evaluates its cells as arrays
+    in one call. Returns an array shaped by the axes, in their order.
+    """
+    _, defaults = METRICS[metric]
+    unknown = set(axes) - set(defaults)
+    if unknown:
+        raise ValueError(f"{metric} has no parameter(s) {', '.join(sorted(unknown))}")
+    params = {**defaults, **(fixed or {})}
+    params = {name: round(value) if name in INTEGER_PARAMS else value for name, value in params.items()}
+    axes = {name: np.asarray(values, dtype=float) for name, values in axes.items()}
+    axes = {name: np.round(values) if name in INTEGER_PARAMS else values for name, values in axes.items()}
+    shape = tuple(len(values) for values in axes.values())
+    cells = int(np.prod(shape))
+
+    bounds = range(0, cells, chunk_cells)
+    tasks = [(metric, axes, params, start, min(start + chunk_cells, cells)) for start in bounds]
+    results = map_chunks(_sweep_chunk, tasks, workers)
+    return np.concatenate(results).reshape(shape) if results else np.empty(shape)
+
+
+def _sweep_chunk(task):
+    metric, axes, params, start, stop = task
+    func, _ = METRICS[metric]
+    positions = np.unravel_index(np.arange(start, stop), tuple(len(v) for v in axes.values()))
+    values = {name: np.full(stop - start, float(value)) for name, value in params.items()}
+    for (name, axis), position in zip(axes.items(), positions):
+        values[name] = axis[position]
+    return np.asarray(func(**values), dtype=float)
@@ -0,0 +1,55 @@
+import numpy as np
+
+from core.roots import newton_bracketed
+
+
+def xirr_batch(ledger, dates, amounts, tol=1e-10, max_iter=100):
+    """
+    Annualised internal rate of return (in %) for many cash-flow ledgers.
+
+    `ledger` holds an integer id 0..k-1 per cash flow, `dates` the flow
+    dates (datetime64 or day numbers) and `amounts` signed values:
+    investments negative, redemptions and current value positive. Flows
+    need not be sorted. All ledgers are solved together with a bracketed
+    Newton search on the NPV, started from the rate implied by the gain
+    multiple over the money-weighted holding period.
+
+    Returns a RootResult with one entry per ledger; ledgers whose flows
+    never change sign are reported as not converged.
+    """
+    ledger = np.asarray(ledger, dtype=np.int64)
+    amounts = np.asarray(amounts, dtype=float)
+    dates = np.asarray(dates)
+    if np.issubdtype(dates.dtype, np.datetime64):
+        days = dates.astype("datetime64[D]").astype(float)
+    else:
+        days = dates.astype(float)
+    count = int(ledger.max(initial=-1)) + 1
+
+    first = np.full(count, np.inf)
+    np.minimum.at(first, ledger, days)
+    years = (days - first[ledger]) / 365.0
+
+    def total(weights):
+        return np.bincount(ledger, weights=weights, minlength=count)
+
+    def npv(rate, idx):
+        rates = np.zeros(count)
+        rates[idx] = rate
+        growth = np.log1p(rates)[ledger]
+        discounted = amounts * np.exp(-years * growth)
+        value = total(discounted)
+        slope = total(-years * discounted / (1 + rates[ledger]))
+        return value[idx], slope[idx]
+
+    inflow = np.maximum(amounts, 0)
+    outflow = np.maximum(-amounts, 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        multiple = total(inflow) / total(outflow)
+        held = total(inflow * years) / total(inflow) - total(outflow * years) / total(outflow)
+        guess = np.where(held > 0, multiple ** (1 / held) - 1, 0.1)
+    guess = np.clip(np.nan_to_num(guess, nan=0.1), -0.9, 10.0)
+
+    result = newton_bracketed(npv, -0.9999, 100.0, guess, tol=tol, max_iter=max_iter)
+    result.root = result.root * 100
+    return result
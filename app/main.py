@@ -1,9 +1,8 @@
 # app/main.py
 import streamlit as st
-from calculators import home_loan_emi, sip, step_up_sip, lumpsum_investment, loan_comparision
-from ml_tools import inflation_forecast, retirement_planner, inflation_adjusted_sip
 from utils.common import set_page_config
-from utils import export  
+from utils.registry import TOOLS, IMPORT_TIMES, load_tool
+from core.cache import cache_stats
 
 # Configure page
 set_page_config()
@@ -92,42 +91,35 @@ if not st.session_state.active_tool:
             if st.button("🚀 Launch", key=key):
                 st.session_state.active_tool = title
                 st.session_state.clicked_icon = key
+                st.rerun()
 
-    row1 = st.columns(3)
-    render_card("🏠", "Home Loan EMI", "home", row1[0])
-    render_card("💰", "SIP Calculator", "sip", row1[1])
-    render_card("📈", "Step-up SIP", "step", row1[2])
-
-    row2 = st.columns(3)
-    render_card("💸", "Lumpsum Investment", "lump", row2[0])
-    render_card("📊", "Inflation Forecast", "inf", row2[1])
-    render_card("🧓", "Retirement Planner", "retire", row2[2])
-
-    row3 = st.columns(3)
-    render_card("📉", "Inflation-Adjusted SIP", "sipinf", row3[0])
-    render_card("⚖️", "Loan Comparison", "loancomp", row3[1])
+    for i in range(0, len(TOOLS), 3):
+        row = st.columns(3)
+        for tool, col in zip(TOOLS[i:i + 3], row):
+            render_card(tool.icon, tool.title, tool.key, col)
 
 else:
     st.markdown("<div class='back-btn'>", unsafe_allow_html=True)
     if st.button("⬅️ Back to Dashboard"):
         st.session_state.active_tool = None
         st.session_state.clicked_icon = None
+        st.rerun()
     st.markdown("</div>", unsafe_allow_html=True)
 
-    if st.session_state.active_tool == "Home Loan EMI":
-        home_loan_emi.render()
-    elif st.session_state.active_tool == "SIP Calculator":
-        sip.render()
-    elif st.session_state.active_tool == "Step-up SIP":
-        step_up_sip.render()
-    elif st.session_state.active_tool == "Lumpsum Investment":
-        lumpsum_investment.render()
-    elif st.session_state.active_tool == "Inflation Forecast":
-        inflation_forecast.render()
-    elif st.session_state.active_tool == "Retirement Planner":
-        retirement_planner.render()
-    elif st.session_state.active_tool == "Inflation-Adjusted SIP":
-        inflation_adjusted_sip.render()
-    elif st.session_state.active_tool == "Loan Comparison":
-        loan_comparision.render()
+    # Widgets inside the tool rerun only the tool, not the CSS, banner and
+    # navigation above it; sections with their own widgets are nested
+    # fragments and rerun on their own
+    st.fragment(load_tool(st.session_state.active_tool).render)()
+
+# Tool modules are imported on first launch; show what that cost
+if IMPORT_TIMES:
+    with st.sidebar.expander("⏱️ Tool Import Times"):
+        for module, seconds in IMPORT_TIMES.items():
+            st.caption(f"{module}: {seconds * 1000:.0f} ms")
 
+stats = {name: entry for name, entry in cache_stats().items() if entry.hits or entry.misses}
+if stats:
+    with st.sidebar.expander("🗄️ Cache Stats"):
+        for name, entry in stats.items():
+            st.caption(f"{name}: {entry.hits} hits, {entry.misses} misses ({entry.disk_hits} from disk), "
+                       f"{entry.entries} entries, {entry.bytes / 2**20:.1f} MB")
@@ -1,12 +1,36 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from utils.export import generate_csv_download, generate_pdf_report
+from utils.export import export_options
 from utils.common import format_inr
+from core.sip import sip_future_value, sip_path_curves, annual_to_monthly
 
 def future_value_sip(pmt, rate, n):
-    r = rate / 100 / 12
-    return pmt * (((1 + r) ** n - 1) / r) * (1 + r)
+    return float(sip_future_value(pmt, rate, n))
+
+def path_to_monthly(path, months):
+    """
+    Per-month return and inflation rates from a path table with a Year or
+    Month column and annual "Return (%)" / "Inflation (%)" columns. The
+    last row is carried forward if the path is shorter than the plan.
+    """
+    columns = {str(c).strip().lower().split(" ")[0]: c for c in path.columns}
+    missing = {"return", "inflation"} - set(columns)
+    if missing:
+        raise ValueError(f"Path is missing column(s): {', '.join(sorted(missing))}")
+    path = path.dropna(subset=[columns["return"], columns["inflation"]])
+    if path.empty:
+        raise ValueError("Path has no rows")
+    repeat = 1 if "month" in columns else 12
+    returns, inflation = annual_to_monthly(
+        path[columns["return"]].to_numpy(dtype=float),
+        path[columns["inflation"]].to_numpy(dtype=float),
+        repeat=repeat,
+    )
+    if len(returns) < months:
+        returns = np.pad(returns, (0, months - len(returns)), mode="edge")
+        inflation = np.pad(inflation, (0, months - len(inflation)), mode="edge")
+    return returns[:months], inflation[:months]
 
 def render():
     st.header("📉 Inflation-Adjusted SIP Returns")
@@ -18,13 +42,33 @@ def render():
 
     months = years * 12
 
-    # Nominal future value
-    nominal_fv = future_value_sip(monthly_investment, annual_return, months)
+    rate_mode = st.radio("Return & Inflation", ["Constant", "Year-by-year Path"], horizontal=True)
+    st.caption("Real value is the nominal value deflated by the cumulative inflation.")
+
+    if rate_mode == "Constant":
+        # A flat path, so both modes value identical rates identically
+        monthly_returns, monthly_inflation = annual_to_monthly([annual_return], [inflation_rate], repeat=months)
+    else:
+        uploaded = st.file_uploader(
+            "Upload a path CSV (Year or Month, Return (%), Inflation (%))", type=["csv"]
+        )
+        if uploaded is not None:
+            path = pd.read_csv(uploaded)
+        else:
+            path = st.data_editor(pd.DataFrame({
+                "Year": list(range(1, years + 1)),
+                "Return (%)": [annual_return] * years,
+                "Inflation (%)": [inflation_rate] * years,
+            }), key="sip_rate_path")
+        try:
+            monthly_returns, monthly_inflation = path_to_monthly(path, months)
+        except ValueError as exc:
+            st.error(str(exc))
+            return
 
-    # Inflation-adjusted FV
-    real_rate = ((1 + annual_return / 100) / (1 + inflation_rate / 100)) - 1
-    real_rate_percent = real_rate * 100
-    real_fv = future_value_sip(monthly_investment, real_rate_percent, months)
+    nominal, real = sip_path_curves(monthly_investment, monthly_returns, monthly_inflation)
+
+    nominal_fv, real_fv = nominal[-1], real[-1]
 
     st.success(f"📈 Nominal Future Value: {format_inr(nominal_fv)}")
     st.success(f"🔥 Inflation-adjusted (Real) Future Value: {format_inr(real_fv)}")
@@ -32,21 +76,18 @@ def render():
     # Yearly data for plotting
     df = pd.DataFrame({
         "Year": list(range(1, years + 1)),
-        "Nominal Value": [future_value_sip(monthly_investment, annual_return, y * 12) for y in range(1, years + 1)],
-        "Real Value": [future_value_sip(monthly_investment, real_rate_percent, y * 12) for y in range(1, years + 1)]
+        "Nominal Value": nominal[12::12],
+        "Real Value": real[12::12]
     })
     st.line_chart(df.set_index("Year"))
 
     # Export
-    st.markdown("### 📤 Export Options")
-    generate_csv_download(df, filename="sip_inflation_adjusted.csv")
-
     summary = {
         "Monthly Investment": format_inr(monthly_investment),
-        "Expected Return": f"{annual_return:.2f}%",
-        "Inflation Rate": f"{inflation_rate:.2f}%",
+        "Expected Return": f"{annual_return:.2f}%" if rate_mode == "Constant" else "Path",
+        "Inflation Rate": f"{inflation_rate:.2f}%" if rate_mode == "Constant" else "Path",
         "Duration": f"{years} years",
         "Nominal Future Value": format_inr(nominal_fv),
         "Real Future Value": format_inr(real_fv)
     }
-    generate_pdf_report(summary, filename="sip_inflation_summary.pdf")
+    export_options(df, "sip_inflation_adjusted.csv", summary, "sip_inflation_summary.pdf")
@@ -1,16 +1,85 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from utils.export import generate_csv_download, generate_pdf_report
+from utils.export import export_options
 from utils.common import format_inr
+from core import retirement
+from core.goals import required_sip
+from core.monte_carlo import RetirementScenario, simulate_retirement
+from core.cache import memoize
+
+cached_simulate_retirement = memoize(maxsize=16)(simulate_retirement)
 
 def future_value(pmt, rate, n):
-    r = rate / 100
-    return pmt * (((1 + r) ** n - 1) / r)
+    return float(retirement.future_value(pmt, rate, n))
 
 def corpus_needed(expense, inflation, years):
-    adjusted_expense = expense * ((1 + inflation / 100) ** years)
-    return adjusted_expense * 12 * 30  # 30x rule
+    return float(retirement.corpus_needed(expense, inflation, years))
+
+@st.fragment
+def render_monte_carlo(current_age, retirement_age, end_age, expense, inflation, returns):
+    st.markdown("### 🎲 Monte Carlo Simulation")
+
+    with st.form("monte_carlo"):
+        savings = st.number_input("🏦 Current Savings (₹)", value=500000.0, min_value=0.0)
+        monthly_saving = st.number_input("💰 Monthly Saving Until Retirement (₹)", value=20000.0, min_value=0.0)
+        step_up = st.slider("📈 Yearly Increase in Saving (%)", 0, 20, 5)
+        return_vol = st.slider("🌪️ Return Volatility (% p.a.)", 0.0, 30.0, 12.0)
+        inflation_vol = st.slider("🔥 Inflation Volatility (% p.a.)", 0.0, 5.0, 1.5)
+        n_paths = st.select_slider("Simulated Paths", [10_000, 50_000, 100_000, 250_000, 500_000], 100_000)
+        seed = st.number_input("Random Seed", value=42, min_value=0, step=1)
+        submitted = st.form_submit_button("🎲 Run Simulation")
+
+    scenario = RetirementScenario(
+        current_age=current_age,
+        retirement_age=retirement_age,
+        end_age=end_age,
+        monthly_expense=expense,
+        current_savings=savings,
+        monthly_saving=monthly_saving,
+        saving_step_up=step_up,
+        mean_return=returns,
+        return_volatility=return_vol,
+        mean_inflation=inflation,
+        inflation_volatility=inflation_vol,
+    )
+    key = (scenario, n_paths, int(seed))
+    if submitted:
+        with st.spinner(f"Simulating {n_paths:,} paths..."):
+            result = cached_simulate_retirement(scenario, n_paths=n_paths, seed=int(seed))
+        st.session_state.monte_carlo_result = (key, result)
+
+    stored = st.session_state.get("monte_carlo_result")
+    if stored is None or stored[0] != key:
+        st.info("Set the assumptions and run the simulation.")
+        return
+    result = stored[1]
+
+    low, mid, high = result.retirement_percentiles
+    st.success(f"✅ Probability Money Lasts Until Age {end_age}: {result.success_probability:.1%}")
+    st.info(f"🎯 Corpus at Retirement - 10th percentile: {format_inr(low)}")
+    st.info(f"🎯 Corpus at Retirement - Median: {format_inr(mid)}")
+    st.info(f"🎯 Corpus at Retirement - 90th percentile: {format_inr(high)}")
+
+    df = pd.DataFrame({
+        "Age": result.ages,
+        "10th Percentile": result.bands[0],
+        "Median": result.bands[1],
+        "90th Percentile": result.bands[2],
+    })
+    st.line_chart(df.set_index("Age"))
+
+    summary = {
+        "Current Age": current_age,
+        "Retirement Age": retirement_age,
+        "Money Needed Until Age": end_age,
+        "Simulated Paths": f"{n_paths:,}",
+        "Seed": int(seed),
+        "Success Probability": f"{result.success_probability:.1%}",
+        "Median Corpus at Retirement": format_inr(mid),
+        "10th Percentile Corpus": format_inr(low),
+    }
+    export_options(df, "retirement_monte_carlo.csv", summary, "retirement_monte_carlo.pdf")
 
 def render():
     st.header("🧓 Retirement Planner & FIRE Estimator")
@@ -22,6 +91,11 @@ def render():
     returns = st.slider("📉 Expected Returns on Investment (%)", 5.0, 15.0, 10.0)
     post_retire_age = st.slider("🧓 Income Required Until Age", retirement_age + 1, 100, 85)
 
+    mode = st.radio("Projection", ["Deterministic", "Monte Carlo"], horizontal=True)
+    if mode == "Monte Carlo":
+        render_monte_carlo(current_age, retirement_age, post_retire_age, expense, inflation, returns)
+        return
+
     years_to_retire = retirement_age - current_age
     years_post_retire = post_retire_age - retirement_age
 
@@ -36,21 +110,19 @@ def render():
     st.success(f"🔥 FIRE Corpus (If retiring today): {format_inr(fire_corpus)}")
     st.success(f"🎯 Corpus Needed at Retirement (Age {retirement_age}): {format_inr(corpus_required)}")
 
+    monthly_sip_needed = float(required_sip(corpus_required, returns, years_to_retire * 12))
+    st.info(f"💰 Monthly SIP Needed to Build It: {format_inr(monthly_sip_needed)}")
+
     # 📈 Plot Corpus Growth Over Years
-    yearly_data = []
-    for i in range(1, years_to_retire + 1):
-        inflated_exp = expense * ((1 + inflation / 100) ** i)
-        annual_exp = inflated_exp * 12
-        corpus = future_value(annual_exp, returns, years_post_retire)
-        yearly_data.append([current_age + i, corpus])
-
-    df = pd.DataFrame(yearly_data, columns=["Age", "Corpus Required"])
+    ages = np.arange(current_age + 1, retirement_age + 1)
+    inflated_exp = expense * ((1 + inflation / 100) ** (ages - current_age))
+    df = pd.DataFrame({
+        "Age": ages,
+        "Corpus Required": retirement.future_value(inflated_exp * 12, returns, years_post_retire),
+    })
     st.line_chart(df.set_index("Age"))
 
     # 📤 Export
-    st.markdown("### 📤 Export Options")
-    generate_csv_download(df, filename="retirement_projection.csv")
-
     summary = {
         "Current Age": current_age,
         "Retirement Age": retirement_age,
@@ -59,6 +131,7 @@ def render():
         "Expected Returns": f"{returns:.2f}%",
         "Years to Retire": years_to_retire,
         "Corpus at Retirement": format_inr(corpus_required),
+        "Monthly SIP Needed": format_inr(monthly_sip_needed),
         "FIRE Corpus Today": format_inr(fire_corpus)
     }
-    generate_pdf_report(summary, filename="retirement_summary.pdf")
+    export_options(df, "retirement_projection.csv", summary, "retirement_summary.pdf")
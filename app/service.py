@@ -0,0 +1,239 @@
+"""
+Local HTTP JSON service for the calculators the pages show.
+
+    python app/service.py --port 8765
+    curl -d '{"principal": 2500000, "rate": 8.5, "years": 20}' localhost:8765/emi
+
+POST one scenario as a JSON object to /<calculation> (any of the batch
+kernels: sip, step_up_sip, lumpsum, emi, loan_comparison, retirement) and
+get its results back. Requests arriving together are computed as one
+vectorized batch per calculation, and responses for repeated inputs are
+served from a cache. GET /health and /stats report on the service.
+"""
+import argparse
+import asyncio
+import dataclasses
+import json
+
+import numpy as np
+
+from core.batch import KERNELS, NAMED_VALUES, InvalidScenario, output_rows, run_kernel, validate
+from core.cache import MemoCache
+
+MAX_BATCH = 1024
+MAX_DELAY = 0.001       # seconds a request waits for others to batch with
+CACHE_SIZE = 100_000
+MAX_BODY = 64 * 2**10
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+            500: "Internal Server Error"}
+
+
+class MicroBatcher:
+    """
+    Collects single scenarios for one kernel and computes them together,
+    once `max_batch` are waiting or `max_delay` seconds after the first.
+    """
+
+    def __init__(self, kernel, max_batch=MAX_BATCH, max_delay=MAX_DELAY):
+        self.kernel = kernel
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.batches = self.scenarios = 0
+        self._pending = []      # (values, future)
+        self._timer = None
+
+    def submit(self, values):
+        """Future of the output dict for `values`, one float per kernel column."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((values, future))
+        if len(self._pending) >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self.flush)
+        return future
+
+    def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.batches += 1
+        self.scenarios += len(batch)
+        columns = dict(zip(batch[0][0], zip(*(values.values() for values, _ in batch))))
+        try:
+            rows = output_rows(run_kernel(self.kernel, columns))
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), row in zip(batch, rows):
+            if not future.done():
+                future.set_result(row)
+
+
+class CalculationService:
+    """Request handling, batching and the response cache, independent of the socket server."""
+
+    def __init__(self, max_batch=MAX_BATCH, max_delay=MAX_DELAY, cache_size=CACHE_SIZE):
+        self.batchers = {name: MicroBatcher(name, max_batch, max_delay) for name in KERNELS}
+        self.cache = MemoCache("service", maxsize=cache_size)
+        self._inflight = {}
+
+    async def handle(self, method, path, body):
+        """(status, response body bytes) for one request."""
+        name = path.split("?", 1)[0].strip("/")
+        if name in ("health", "stats"):
+            if method != "GET":
+                return 405, _error("Use GET")
+            return 200, json.dumps({"status": "ok"} if name == "health" else self.stats()).encode()
+        if name not in KERNELS:
+            return 404, _error(f"Unknown calculation '{name}'; use one of {', '.join(KERNELS)}")
+        if method != "POST":
+            return 405, _error("Use POST with a JSON object")
+        try:
+            values = scenario_values(name, json.loads(body or b"{}"))
+            key = (name,) + tuple(values.values())
+            found, response = self.cache.get(key)
+            if found:
+                return 200, response
+            # Only valid scenarios are ever cached, so the domain checks can wait for a miss
+            validate(name, {column: np.array([value]) for column, value in values.items()})
+        except InvalidScenario as exc:
+            return 400, _error(str(exc), exc.field)
+        except (ValueError, TypeError) as exc:
+            return 400, _error(str(exc))
+
+        # Identical requests in flight share one computation
+        future = self._inflight.get(key)
+        if future is None:
+            future = self._inflight[key] = asyncio.ensure_future(self._compute(name, key, values))
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        try:
+            return 200, await asyncio.shield(future)
+        except (ValueError, FloatingPointError) as exc:
+            return 400, _error(str(exc))
+        except Exception as exc:
+            return 500, _error(f"{type(exc).__name__}: {exc}")
+
+    async def _compute(self, name, key, values):
+        response = json.dumps(await self.batchers[name].submit(values)).encode()
+        self.cache.set(key, response)
+        return response
+
+    def stats(self):
+        batches = {
+            name: {"batches": b.batches, "scenarios": b.scenarios} for name, b in self.batchers.items() if b.batches
+        }
+        return {"batches": batches, "cache": dataclasses.asdict(self.cache.stats())}
+
+
+def scenario_values(name, payload):
+    """
+    Every input of kernel `name` as a float, from a JSON object, as
+    core.batch.parse_column reads it. Raises InvalidScenario for a
+    missing or non-numeric field; the domain checks are left to validate.
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("Body must be a JSON object")
+    kernel = KERNELS[name]
+    values = {}
+    for column in kernel.inputs + tuple(kernel.defaults):
+        raw = payload.get(column, kernel.defaults.get(column))
+        raw = NAMED_VALUES.get(column, {}).get(raw, raw) if isinstance(raw, str) else raw
+        if raw is None or raw == "":
+            raise InvalidScenario(column, "is missing", 0)
+        try:
+            values[column] = float(raw)
+        except (ValueError, TypeError):
+            raise InvalidScenario(column, f"must be a number, got {raw!r}", 0) from None
+    return values
+
+
+def _error(message, field=None):
+    return json.dumps({"error": message} if field is None else {"error": message, "field": field}).encode()
+
+
+async def serve_connection(service, reader, writer):
+    """HTTP/1.1 with keep-alive: one request after another on the connection."""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line.strip():
+                break
+            try:
+                method, path, version = request_line.decode("latin-1").split()
+            except ValueError:
+                writer.write(_response(400, _error("Malformed request line"), False))
+                break
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                field, _, value = line.decode("latin-1").partition(":")
+                headers[field.strip().lower()] = value.strip().lower()
+
+            length = int(headers.get("content-length") or 0)
+            if length > MAX_BODY:
+                writer.write(_response(413, _error(f"Body over {MAX_BODY} bytes"), False))
+                break
+            body = await reader.readexactly(length)
+            keep_alive = headers.get("connection") != "close" and version != "HTTP/1.0"
+            status, response = await service.handle(method, path, body)
+            writer.write(_response(status, response, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+def _response(status, body, keep_alive):
+    head = (
+        f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+async def start(host="127.0.0.1", port=8765, service=None):
+    """Listening asyncio server for `service`; port 0 picks a free port."""
+    service = service or CalculationService()
+    return await asyncio.start_server(lambda r, w: serve_connection(service, r, w), host, port, backlog=1024)
+
+
+async def serve(host="127.0.0.1", port=8765, service=None):
+    """Run the service until cancelled."""
+    server = await start(host, port, service)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the finance calculators as a local HTTP JSON API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH, help="scenarios computed together at most")
+    parser.add_argument("--max-delay-ms", type=float, default=MAX_DELAY * 1000,
+                        help="how long a request may wait for others to batch with")
+    parser.add_argument("--cache-size", type=int, default=CACHE_SIZE, help="responses kept for repeated inputs")
+    args = parser.parse_args(argv)
+
+    service = CalculationService(args.max_batch, args.max_delay_ms / 1000, args.cache_size)
+    print(f"Serving {', '.join(KERNELS)} on http://{args.host}:{args.port}/")
+    try:
+        asyncio.run(serve(args.host, args.port, service))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import numpy as np
+import streamlit as st
+from core.downsample import lttb_indices
+
+# Points per series sent to the browser; longer series are downsampled
+MAX_POINTS = 2000
+# Budget shared by all series of a figure, so overlaying more scenarios
+# gives each fewer points instead of a bigger payload
+TOTAL_POINTS = 20000
+MIN_POINTS = 100
+# Figures with more points than this in total are drawn with WebGL
+WEBGL_POINTS = 5000
+
+def line_figure(series, title="", xaxis_title="", yaxis_title="", colors=None, max_points=MAX_POINTS):
+    """
+    Plotly figure with one line per entry of `series`, a mapping of
+    label -> (x, y). Each series is LTTB-downsampled to at most
+    `max_points`, with a shared TOTAL_POINTS budget across series, and
+    the figure switches to Scattergl once the total stays large, so the
+    payload and browser work are bounded however long the schedules or
+    however many scenarios are overlaid.
+    """
+    import plotly.graph_objects as go  # only pages that chart pay for plotly
+
+    budget = min(max_points, max(MIN_POINTS, TOTAL_POINTS // max(len(series), 1)))
+    reduced = {}
+    for label, (x, y) in series.items():
+        x, y = np.asarray(x), np.asarray(y)
+        keep = lttb_indices(x, y, budget)
+        reduced[label] = (x[keep], y[keep])
+
+    total = sum(len(x) for x, _ in reduced.values())
+    trace = go.Scattergl if total > WEBGL_POINTS else go.Scatter
+    colors = colors or {}
+    fig = go.Figure([
+        trace(x=x, y=y, name=label, mode="lines",
+              line=dict(color=colors[label]) if label in colors else None)
+        for label, (x, y) in reduced.items()
+    ])
+    fig.update_layout(title=title, xaxis_title=xaxis_title, yaxis_title=yaxis_title)
+    return fig
+
+def plot_lines(series, **options):
+    st.plotly_chart(line_figure(series, **options), use_container_width=True)
+
+def plot_frame(df, x, columns, **options):
+    """Plot several columns of `df` against column `x`."""
+    plot_lines({column: (df[x].to_numpy(), df[column].to_numpy()) for column in columns}, **options)
@@ -1,5 +1,6 @@
 import streamlit as st
-import plotly.graph_objects as go
+from core.loans import loan_emi
+from utils.formatting import format_inr
 
 def set_page_config():
     st.set_page_config(page_title="Finance Calculator", layout="wide")
@@ -10,23 +11,11 @@ def calculate_emi(P, R, N):
     EMI = [P * r * (1 + r)^N] / [(1 + r)^N – 1]
     where r = annual interest / 12 / 100
     """
-    r = R / (12 * 100)
-    emi = P * r * ((1 + r) ** N) / (((1 + r) ** N) - 1)
-    return emi
+    return float(loan_emi(P, R, N))
 
 def plot_investment_vs_return(df, investment_label="Investment", return_label="Returns"):
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=df['Date'], y=df[investment_label], name=investment_label, line=dict(color='blue')))
-    fig.add_trace(go.Scatter(x=df['Date'], y=df[return_label], name=return_label, line=dict(color='green')))
-    fig.update_layout(title="Time vs Money", xaxis_title="Date", yaxis_title="Amount (₹)")
-    st.plotly_chart(fig, use_container_width=True)
-import locale
+    from utils.charts import plot_frame
 
-def format_inr(amount):
-    """Format a number in Indian comma style with ₹ sign"""
-    try:
-        locale.setlocale(locale.LC_ALL, 'en_IN.UTF-8')
-    except:
-        # fallback for Windows
-        locale.setlocale(locale.LC_ALL, '')
-    return f"₹{locale.format_string('%d', amount, grouping=True)}"
+    plot_frame(df, "Date", [investment_label, return_label], title="Time vs Money",
+               xaxis_title="Date", yaxis_title="Amount (₹)",
+               colors={investment_label: "blue", return_label: "green"})
@@ -1,15 +1,81 @@
 import pandas as pd
-from fpdf import FPDF
-import base64
 import streamlit as st
-import os
+import gzip
+import io
+import threading
+from concurrent.futures import Future
+from core.cache import MemoCache, make_key
+from utils.formatting import format_inr_columns
 
-def generate_csv_download(df, filename="data.csv"):
-    csv = df.to_csv(index=False)
-    b64 = base64.b64encode(csv.encode()).decode()
-    st.markdown(f"📥 [Download CSV](data:file/csv;base64,{b64})", unsafe_allow_html=True)
+# Exports are built once per distinct input, only after the user asks for
+# them, and the bytes are shared by every session that wants the same file
+_BYTES = MemoCache("exports", maxsize=128, max_bytes=128 * 2**20)
+_PENDING = {}
+_PENDING_LOCK = threading.Lock()
+
+# Label -> (file extension, MIME type)
+TABLE_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "CSV (gzip)": ("csv.gz", "application/gzip"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Arrow IPC": ("arrow", "application/vnd.apache.arrow.file"),
+}
+CHUNK_ROWS = 100_000
+
+def iter_table(df, fmt, chunk_rows=CHUNK_ROWS):
+    """
+    Serialize `df` in one of TABLE_FORMATS, yielding the file as byte
+    chunks while encoding `chunk_rows` rows at a time, so a large
+    schedule never exists as one big string.
+    """
+    chunks = (df.iloc[i:i + chunk_rows] for i in range(0, max(len(df), 1), chunk_rows))
+    if fmt == "CSV":
+        for i, chunk in enumerate(chunks):
+            yield chunk.to_csv(index=False, header=i == 0).encode("utf-8")
+        return
+
+    buffer = io.BytesIO()
+    if fmt == "CSV (gzip)":
+        with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=6, mtime=0) as out:
+            for i, chunk in enumerate(chunks):
+                out.write(chunk.to_csv(index=False, header=i == 0).encode("utf-8"))
+                yield _drain(buffer)
+        yield _drain(buffer)
+        return
+
+    import pyarrow as pa  # only needed for the columnar formats
+
+    schema = pa.Schema.from_pandas(df.iloc[:0], preserve_index=False)
+    if fmt == "Parquet":
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(buffer, schema, compression="zstd")
+    elif fmt == "Arrow IPC":
+        writer = pa.ipc.new_file(buffer, schema)
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+    with writer:
+        for chunk in chunks:
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            yield _drain(buffer)
+    yield _drain(buffer)
+
+def _drain(buffer):
+    data = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return data
+
+def table_bytes(df, fmt):
+    return b"".join(iter_table(df, fmt))
+
+def combine_frames(frames, label="Scenario"):
+    """Stack named DataFrames into one long table with a `label` column."""
+    combined = pd.concat(frames, names=[label, None])
+    return combined.reset_index(level=0).reset_index(drop=True)
+
+def summary_pdf_bytes(data_dict):
+    from fpdf import FPDF  # deferred so pages load without it
 
-def generate_pdf_report(data_dict, filename="report.pdf"):
     pdf = FPDF()
     pdf.add_page()
     pdf.set_font("Arial", size=12)
@@ -17,18 +83,107 @@ def generate_pdf_report(data_dict, filename="report.pdf"):
     for key, value in data_dict.items():
         # Replace ₹ with Rs. to avoid Unicode errors
         if isinstance(value, str):
-            value = value.replace("₹", "Rs.")
+            value = value.replace("₹", "Rs.").replace("—", "-")
         pdf.cell(200, 10, txt=f"{key}: {value}", ln=True)
 
-    pdf.output(filename)
+    out = pdf.output(dest="S")
+    return out.encode("latin-1") if isinstance(out, str) else bytes(out)
+
+def table_pdf_bytes(df, title, money_columns=()):
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    # The base PDF fonts have no ₹ glyph
+    shown = format_inr_columns(df, money_columns, decimals=2, symbol="Rs. ")
+    table = Table([shown.columns.tolist()] + shown.values.tolist())
+    table.setStyle(TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+        ("GRID", (0, 0), (-1, -1), 1, colors.black),
+    ]))
+    doc.build([Paragraph(title, getSampleStyleSheet()["Title"]), table])
+    return buffer.getvalue()
 
-    with open(filename, "rb") as f:
-        b64 = base64.b64encode(f.read()).decode()
-        href = f'<a href="data:application/octet-stream;base64,{b64}" download="{filename}">📄 Download PDF Report</a>'
-        st.markdown(href, unsafe_allow_html=True)
+def _fingerprint(value):
+    if isinstance(value, pd.DataFrame):
+        return ("frame", tuple(map(str, value.columns)), tuple(map(str, value.dtypes)),
+                pd.util.hash_pandas_object(value, index=False).to_numpy())
+    return value
 
-    # Clean up file after use
+def build_export(builder, *args):
+    """
+    Bytes returned by builder(*args). The first session to ask builds them
+    on its own script thread; identical requests meanwhile wait for that
+    build instead of starting another, and later ones hit the cache.
+    """
+    key = make_key((builder.__name__,) + tuple(_fingerprint(a) for a in args), {})
+    found, data = _BYTES.get(key)
+    if found:
+        return data
+    with _PENDING_LOCK:
+        future = _PENDING.get(key)
+        owner = future is None
+        if owner:
+            future = _PENDING[key] = Future()
+    if not owner:
+        return future.result()
     try:
-        os.remove(filename)
-    except:
-        pass
+        data = builder(*args)
+        _BYTES.set(key, data)
+        future.set_result(data)
+        return data
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    finally:
+        with _PENDING_LOCK:
+            _PENDING.pop(key, None)
+
+def generate_csv_download(df, filename="data.csv"):
+    generate_table_download(df, filename=filename, fmt="CSV")
+
+def generate_table_download(df, filename="data.csv", fmt="CSV"):
+    """Download button for `df` in one of TABLE_FORMATS; `filename` gets the matching extension."""
+    extension, mime = TABLE_FORMATS[fmt]
+    stem = filename.rsplit(".", 1)[0]
+    st.download_button(f"📥 Download {fmt}", build_export(table_bytes, df, fmt), file_name=f"{stem}.{extension}",
+                       mime=mime, key=f"download_{stem}_{extension}")
+
+def generate_pdf_report(data_dict, filename="report.pdf"):
+    st.download_button("📄 Download PDF Report", build_export(summary_pdf_bytes, data_dict), file_name=filename,
+                       mime="application/pdf", key=f"download_{filename}")
+
+def generate_table_pdf(df, title, filename="report.pdf", money_columns=()):
+    st.download_button("📄 Download PDF Report", build_export(table_pdf_bytes, df, title, tuple(money_columns)), file_name=filename,
+                       mime="application/pdf", key=f"download_{filename}")
+
+@st.fragment
+def export_options(df=None, csv_filename=None, summary=None, pdf_filename=None, pdf_title=None,
+                   money_columns=(), heading="📤 Export Options"):
+    """
+    Export section that reruns on its own. The files are only built once
+    the user asks for them. `df` can be written as CSV, gzip CSV, Parquet
+    or Arrow IPC; without a summary, a `pdf_title` exports `df` itself as
+    a PDF table, with `money_columns` in lakh/crore grouping. `df` may
+    also be a function returning the frame, for tables costly to build.
+    """
+    st.markdown(f"### {heading}")
+    key = f"export_{csv_filename or pdf_filename}"
+    if df is not None and csv_filename:
+        fmt = st.selectbox("Table Format", list(TABLE_FORMATS), key=f"{key}_format")
+    if not st.toggle("Prepare downloads", key=key):
+        return
+    with st.spinner("Preparing downloads..."):
+        if callable(df):
+            df = df()
+        if df is not None and csv_filename:
+            generate_table_download(df, filename=csv_filename, fmt=fmt)
+        if summary is not None:
+            generate_pdf_report(summary, filename=pdf_filename)
+        elif pdf_title is not None:
+            generate_table_pdf(df, pdf_title, filename=pdf_filename, money_columns=money_columns)
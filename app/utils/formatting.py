@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+CRORE = 10_000_000
+LAKH = 100_000
+
+
+def format_inr(amount, decimals=0, abbreviate=False, symbol="₹"):
+    """
+    Format amounts in Indian digit grouping (₹12,34,56,789).
+
+    Works on a scalar, a NumPy array or a pandas Series in one call and
+    returns the same shape of strings. Values are rounded, negatives get a
+    leading minus (-₹1,500), and NaN or infinite values become "—". With
+    `abbreviate`, amounts from a lakh upwards are shortened to "₹12.35 L"
+    or "₹1.23 Cr" with two decimals. No locale is involved, so it is safe
+    to call from any thread.
+    """
+    if isinstance(amount, pd.Series):
+        return pd.Series(_format(amount.to_numpy(dtype=float), decimals, abbreviate, symbol),
+                         index=amount.index, name=amount.name)
+    values = np.asarray(amount, dtype=float)
+    formatted = _format(np.atleast_1d(values).ravel(), decimals, abbreviate, symbol)
+    if values.ndim == 0:
+        return str(formatted[0])
+    return formatted.reshape(values.shape)
+
+
+def format_inr_columns(df, columns, **options):
+    """Copy of `df` with the given money columns formatted for display."""
+    shown = df.copy()
+    for column in columns:
+        shown[column] = format_inr(shown[column], **options)
+    return shown
+
+
+def _format(values, decimals, abbreviate, symbol):
+    # Beyond ~9e18 (after scaling for decimals) int64 digits would overflow
+    finite = np.isfinite(values) & (np.abs(values) * 10 ** max(decimals, 2) < 9e18)
+    safe = np.where(finite, values, 0.0)
+    magnitude = np.abs(safe)
+    prefix = np.where(np.round(safe, decimals) < 0, "-" + symbol, symbol)
+
+    out = np.empty(values.shape, dtype=object)
+    plain = np.ones(values.shape, dtype=bool)
+    if abbreviate:
+        for unit, suffix in ((CRORE, " Cr"), (LAKH, " L")):
+            # Rounding can carry a lakh amount up to 100.00 L; show it as crores
+            use = plain & (np.round(magnitude / unit, 2) >= 1)
+            out[use] = np.strings.add(np.strings.add(prefix[use], _group(magnitude[use] / unit, 2)), suffix)
+            plain &= ~use
+
+    out[plain] = np.strings.add(prefix[plain], _group(magnitude[plain], decimals))
+    out[~finite] = "—"
+    return out
+
+
+def _group(magnitude, decimals):
+    """
+    Digits of non-negative values with lakh/crore commas, as strings.
+
+    Every value is laid out in a fixed-width character matrix, one column
+    per digit or comma counted from the right, and columns beyond a
+    value's own length are left blank, so no Python loop runs per value.
+    """
+    scale = 10 ** decimals
+    scaled = np.round(magnitude * scale).astype(np.int64)
+    whole, fraction = np.divmod(scaled, scale)
+    n_digits = len(str(int(whole.max(initial=0))))
+    powers = 10 ** np.arange(n_digits, dtype=np.int64)
+    digits = (whole[:, None] // powers % 10).astype(np.uint8) + ord("0")
+    length = np.maximum((whole[:, None] >= powers).sum(axis=1), 1)
+
+    columns = []    # right to left
+    if decimals > 0:
+        fraction_powers = 10 ** np.arange(decimals, dtype=np.int64)
+        columns += list((fraction[:, None] // fraction_powers % 10).astype(np.uint8).T + ord("0"))
+        columns.append(np.full(whole.shape, ord("."), dtype=np.uint8))
+    blank = np.uint8(ord(" "))
+    for i in range(n_digits):
+        # Commas come after the first three digits, then after every two
+        if i >= 3 and i % 2 == 1:
+            columns.append(np.where(length > i, np.uint8(ord(",")), blank))
+        columns.append(np.where(i < length, digits[:, i], blank))
+
+    chars = np.ascontiguousarray(np.column_stack(columns[::-1]) if columns else np.empty((0, 0), np.uint8))
+    text = chars.view(f"S{chars.shape[1]}").ravel()
+    return np.strings.lstrip(text).astype(str)
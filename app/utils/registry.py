@@ -0,0 +1,42 @@
+import importlib
+import sys
+import time
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Tool:
+    title: str
+    icon: str
+    key: str
+    module: str     # dotted path of a module exposing render()
+
+
+TOOLS = [
+    Tool("Home Loan EMI", "🏠", "home", "calculators.home_loan_emi"),
+    Tool("SIP Calculator", "💰", "sip", "calculators.sip"),
+    Tool("Step-up SIP", "📈", "step", "calculators.step_up_sip"),
+    Tool("Lumpsum Investment", "💸", "lump", "calculators.lumpsum_investment"),
+    Tool("Inflation Forecast", "📊", "inf", "ml_tools.inflation_forecast"),
+    Tool("Retirement Planner", "🧓", "retire", "ml_tools.retirement_planner"),
+    Tool("Inflation-Adjusted SIP", "📉", "sipinf", "ml_tools.inflation_adjusted_sip"),
+    Tool("Loan Comparison", "⚖️", "loancomp", "calculators.loan_comparision"),
+    Tool("XIRR Returns", "🧾", "xirr", "calculators.xirr_returns"),
+    Tool("Goal Planner", "🎯", "goal", "calculators.goal_planner"),
+    Tool("Sensitivity Sweep", "🗺️", "sweep", "calculators.sensitivity_sweep"),
+]
+TOOLS_BY_TITLE = {tool.title: tool for tool in TOOLS}
+
+# Module path -> seconds spent importing it the first time it was launched
+IMPORT_TIMES = {}
+
+
+def load_tool(title):
+    """Import a tool's module on first use and return it."""
+    module = TOOLS_BY_TITLE[title].module
+    if module in sys.modules:
+        return sys.modules[module]
+    start = time.perf_counter()
+    loaded = importlib.import_module(module)
+    IMPORT_TIMES[module] = time.perf_counter() - start
+    return loaded
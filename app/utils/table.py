@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils.formatting import format_inr_columns
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+def rollup_yearly(df, date_column=None, group_columns=(), last_columns=()):
+    """
+    One row per year (and per `group_columns` value): flows are summed,
+    `last_columns` such as balances keep the year's closing value. The
+    year comes from `date_column`, or from a 1-based "Month" column.
+    """
+    if date_column is not None:
+        year = pd.to_datetime(df[date_column]).dt.year.rename("Year")
+    else:
+        year = ((df["Month"] - 1) // 12 + 1).rename("Year")
+    keys = [df[c] for c in group_columns] + [year]
+    values = df.drop(columns=[c for c in (date_column, "Month") if c in df.columns] + list(group_columns))
+    numeric = values.select_dtypes("number")
+    how = {c: ("last" if c in last_columns else "sum") for c in numeric.columns}
+    return numeric.groupby(keys, sort=True).agg(how).reset_index()
+
+def filter_rows(df, filters=None):
+    """
+    Positions of the rows of `df` passing `filters`, a mapping of column
+    to a collection of allowed values or to an inclusive (low, high) range.
+    """
+    mask = np.ones(len(df), dtype=bool)
+    for column, allowed in (filters or {}).items():
+        if isinstance(allowed, tuple):
+            low, high = allowed
+            mask &= df[column].between(low, high).to_numpy()
+        else:
+            mask &= df[column].isin(allowed).to_numpy()
+    return np.flatnonzero(mask)
+
+def query_table(df, filters=None, sort_by=None, ascending=True, page=1, page_size=50):
+    """
+    Filter, sort and slice `df` on the server. Returns the requested page
+    and the number of matching rows.
+    """
+    matched = df.iloc[filter_rows(df, filters)]
+    if sort_by is not None:
+        # Stable in both directions, with blanks last even in text columns
+        matched = matched.sort_values(sort_by, ascending=ascending, kind="stable", na_position="last")
+    start = (page - 1) * page_size
+    return matched.iloc[start:start + page_size], len(matched)
+
+@st.fragment
+def paged_table(df, key, date_column=None, group_columns=(), last_columns=(), money_columns=()):
+    """
+    Table that keeps `df` on the server and sends only the visible page.
+    Sorting, filtering, paging and the optional yearly rollup rerun only
+    this section.
+    """
+    view = df
+    if date_column is not None or "Month" in df.columns:
+        if st.radio("View", ["Monthly", "Yearly"], horizontal=True, key=f"{key}_rollup") == "Yearly":
+            view = rollup_yearly(df, date_column, group_columns, last_columns)
+
+    filters = {}
+    with st.expander("🔎 Filter & Sort"):
+        for column in group_columns:
+            choices = list(pd.unique(view[column]))
+            picked = st.multiselect(column, choices, default=choices, key=f"{key}_filter_{column}")
+            filters[column] = picked
+        cols = st.columns(2)
+        sort_by = cols[0].selectbox("Sort by", ["(none)"] + list(view.columns), key=f"{key}_sort")
+        descending = cols[1].toggle("Descending", key=f"{key}_desc")
+
+    cols = st.columns(2)
+    page_size = cols[0].selectbox("Rows per page", PAGE_SIZES, index=1, key=f"{key}_size")
+    pages = max(1, -(-len(filter_rows(view, filters)) // page_size))
+    page_key = f"{key}_page"
+    # A narrower filter or bigger page can leave the stored page out of range
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = pages
+    page = cols[1].number_input(f"Page (of {pages})", min_value=1, max_value=pages, key=page_key)
+
+    shown, total = query_table(
+        view, filters, None if sort_by == "(none)" else sort_by, not descending, page, page_size,
+    )
+    money = [c for c in money_columns if c in shown.columns]
+    st.dataframe(format_inr_columns(shown, money, decimals=2), hide_index=True)
+    st.caption(f"{total:,} rows")
@@ -0,0 +1,110 @@
+import asyncio
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from core.batch import output_rows, run_kernel  # noqa: E402
+from service import CalculationService, start  # noqa: E402
+
+EMI = {"principal": 2500000, "rate": 8.5, "years": 20}
+RETIREMENT = {"current_age": 30, "retirement_age": 60, "post_retire_age": 85,
+              "expense": 50000, "inflation": 6, "returns": 10}
+
+
+class ServiceTest(unittest.IsolatedAsyncioTestCase):
+    """Runs the real server on a free localhost port and talks HTTP to it."""
+
+    async def asyncSetUp(self):
+        # A long delay so concurrent requests are sure to share a batch
+        self.service = CalculationService(max_batch=64, max_delay=0.05, cache_size=1000)
+        self.server = await start("127.0.0.1", 0, self.service)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def request(self, method, path, payload=None, raw=None):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        body = raw if raw is not None else (json.dumps(payload).encode() if payload is not None else b"")
+        writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n"
+                     "Connection: close\r\n\r\n".encode() + body)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        head, _, data = response.partition(b"\r\n\r\n")
+        return int(head.split()[1]), json.loads(data)
+
+    async def test_concurrent_requests_share_one_batch(self):
+        scenarios = [dict(EMI, principal=1000000 + 1000 * i) for i in range(20)]
+        responses = await asyncio.gather(*(self.request("POST", "/emi", s) for s in scenarios))
+
+        columns = {name: [s[name] for s in scenarios] for name in EMI}
+        expected = output_rows(run_kernel("emi", columns))
+        self.assertEqual([status for status, _ in responses], [200] * 20)
+        self.assertEqual([body for _, body in responses], expected)
+        self.assertEqual(self.service.batchers["emi"].batches, 1)
+        self.assertEqual(self.service.batchers["emi"].scenarios, 20)
+
+    async def test_max_batch_splits_large_bursts(self):
+        self.service.batchers["sip"].max_batch = 8
+        scenarios = [{"amount": 1000 + i, "rate": 12, "years": 10} for i in range(20)]
+        await asyncio.gather(*(self.request("POST", "/sip", s) for s in scenarios))
+        self.assertEqual(self.service.batchers["sip"].scenarios, 20)
+        self.assertEqual(self.service.batchers["sip"].batches, 3)
+
+    async def test_repeated_inputs_are_served_from_cache(self):
+        first = await self.request("POST", "/retirement", RETIREMENT)
+        second = await self.request("POST", "/retirement", dict(RETIREMENT, expense=50000.0))
+        self.assertEqual(first, second)
+        self.assertEqual(self.service.batchers["retirement"].scenarios, 1)
+        self.assertEqual(self.service.cache.stats().hits, 1)
+
+    async def test_identical_concurrent_requests_compute_once(self):
+        responses = await asyncio.gather(*(self.request("POST", "/emi", EMI) for _ in range(10)))
+        self.assertEqual(len({json.dumps(body) for _, body in responses}), 1)
+        self.assertEqual(self.service.batchers["emi"].scenarios, 1)
+
+    async def test_invalid_inputs_are_rejected_with_the_field(self):
+        cases = [
+            ("/emi", dict(EMI, principal=-1), "principal"),
+            ("/emi", dict(EMI, years=0), "years"),
+            ("/emi", dict(EMI, years=20.05), "years"),
+            ("/emi", dict(EMI, prepay_type=7), "prepay_type"),
+            ("/emi", dict(EMI, rate="8%"), "rate"),
+            ("/emi", {"principal": 2500000, "rate": 8.5}, "years"),
+            ("/sip", {"amount": None, "rate": 12, "years": 10}, "amount"),
+            ("/retirement", dict(RETIREMENT, retirement_age=25), "retirement_age"),
+            ("/retirement", dict(RETIREMENT, post_retire_age=60), "post_retire_age"),
+        ]
+        for path, payload, field in cases:
+            with self.subTest(path=path, payload=payload):
+                status, body = await self.request("POST", path, payload)
+                self.assertEqual(status, 400)
+                self.assertEqual(body["field"], field)
+
+        # json.loads accepts Infinity, so it has to be caught by the domain checks
+        status, body = await self.request("POST", "/emi", raw=b'{"principal": 100000, "rate": 8, "years": Infinity}')
+        self.assertEqual((status, body["field"]), (400, "years"))
+        self.assertEqual(self.service.batchers["emi"].batches, 0)
+
+    async def test_invalid_request_does_not_fail_its_batch(self):
+        good, bad = await asyncio.gather(
+            self.request("POST", "/emi", EMI), self.request("POST", "/emi", dict(EMI, principal=-1)),
+        )
+        self.assertEqual(good[0], 200)
+        self.assertEqual(bad[0], 400)
+
+    async def test_routing_errors(self):
+        self.assertEqual((await self.request("GET", "/health"))[0], 200)
+        self.assertEqual((await self.request("POST", "/nope", {}))[0], 404)
+        self.assertEqual((await self.request("GET", "/emi"))[0], 405)
+        self.assertEqual((await self.request("POST", "/emi", raw=b"{not json"))[0], 400)
+        self.assertEqual((await self.request("POST", "/emi", [1, 2]))[0], 400)
+
+
+if __name__ == "__main__":
+    unittest.main()